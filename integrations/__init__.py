@@ -8,7 +8,10 @@ inherits from BaseIntegration.
 
 import importlib
 import logging
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from .base import BaseIntegration
@@ -16,26 +19,26 @@ from .base import BaseIntegration
 logger = logging.getLogger(__name__)
 
 
-def discover_integrations() -> dict[str, type[BaseIntegration]]:
+@lru_cache(maxsize=1)
+def discover_integrations() -> Mapping[str, type[BaseIntegration]]:
     """
-    Discover all integrations in the integrations directory.
+    Discover all integrations in the integrations directory (cached).
+
+    The directory walk and imports run once per process; call
+    discover_integrations.cache_clear() to force a rescan.
 
     Returns:
-        Dict mapping integration name to integration class
+        Read-only mapping of integration name to integration class
     """
     integrations: dict[str, type[BaseIntegration]] = {}
     integrations_dir = Path(__file__).parent
 
-    for item in integrations_dir.iterdir():
-        if not item.is_dir():
-            continue
+    # One glob instead of is_dir() + exists() stats per directory entry
+    for integration_file in sorted(integrations_dir.glob("*/integration.py")):
+        item = integration_file.parent
         if item.name.startswith("_"):
             continue
 
-        integration_file = item / "integration.py"
-        if not integration_file.exists():
-            continue
-
         try:
             module = importlib.import_module(f"integrations.{item.name}.integration")
 
@@ -50,16 +53,16 @@ def discover_integrations() -> dict[str, type[BaseIntegration]]:
                     integrations[attr.name] = attr
                     break
 
-        except Exception:  # pragma: no cover - defensive error handling
+        except Exception:
             logger.exception("Failed to load integration '%s'", item.name)
 
-    return integrations
+    return MappingProxyType(integrations)
 
 
 def load_integration(
     name: str,
     config: dict[str, Any],
-    integrations: dict[str, type[BaseIntegration]] | None = None,
+    integrations: Mapping[str, type[BaseIntegration]] | None = None,
 ) -> BaseIntegration:
     """
     Load and instantiate an integration by name.
@@ -67,7 +70,7 @@ def load_integration(
     Args:
         name: Integration name (e.g., "todoist")
         config: Integration-specific config from credentials.yaml
-        integrations: Optional pre-discovered integrations dict
+        integrations: Optional pre-discovered integrations mapping
 
     Returns:
         Instantiated integration object
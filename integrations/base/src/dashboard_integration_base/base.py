@@ -6,13 +6,35 @@ the required methods. This ensures a consistent pattern that AI
 agents can easily follow when creating new integrations.
 """
 
+import re
 import sys
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from functools import cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, AsyncIterator, ClassVar, Optional, Type
 
-from jinja2 import Environment, FileSystemLoader
-from pydantic import BaseModel, ConfigDict, ValidationError
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+
+
+@cache
+def _get_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """
+    Get the template bytecode cache shared across processes.
+
+    Created with the first template environment rather than at import, since
+    it makes a directory under the system temp dir. Falls back to no cache
+    (templates are compiled in memory) if that directory is unusable.
+
+    Returns:
+        Shared bytecode cache, or None if it cannot be created
+    """
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
 
 
 class IntegrationConfig(BaseModel):
@@ -33,6 +55,35 @@ class IntegrationConfig(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
+# Attribute holding each ConfigModel's validator, set on the model class itself
+_ADAPTER_ATTR = "__integration_config_adapter__"
+
+
+def _config_adapter(
+    model: Type[IntegrationConfig],
+) -> TypeAdapter[IntegrationConfig]:
+    """
+    Get the validator for a ConfigModel, built on first use.
+
+    Keyed on the model class itself, so a ConfigModel assigned or patched
+    after its integration class was defined is still the one validated.
+    The adapter is stored on the model rather than in a module-level cache,
+    so it lives only as long as the model does.
+
+    Args:
+        model: ConfigModel class to validate against
+
+    Returns:
+        TypeAdapter shared by every integration using that model
+    """
+    # Read the model's own __dict__ so a subclass never reuses its parent's
+    adapter = model.__dict__.get(_ADAPTER_ATTR)
+    if adapter is None:
+        adapter = TypeAdapter(model)
+        setattr(model, _ADAPTER_ATTR, adapter)
+    return adapter
+
+
 class BaseIntegration(ABC):
     """
     Base class for all dashboard integrations.
@@ -65,36 +116,43 @@ class BaseIntegration(ABC):
     ConfigModel: ClassVar[Optional[Type[IntegrationConfig]]] = None
 
     # Keys that should never be exposed to templates
-    _sensitive_keys: ClassVar[set[str]] = {
-        "api_key",
-        "token",
-        "secret",
-        "password",
-        "credentials",
-        "key",
-    }
-
-    def __init__(self, config: dict[str, Any]) -> None:
+    _sensitive_keys: ClassVar[frozenset[str]] = frozenset(
+        {
+            "api_key",
+            "token",
+            "secret",
+            "password",
+            "credentials",
+            "key",
+        }
+    )
+
+    # Jinja2 environments shared by all instances, keyed by defining module
+    _template_env_cache: ClassVar[dict[str, Environment]] = {}
+
+    def __init__(self, config: dict[str, Any] | IntegrationConfig) -> None:
         """
         Initialize the integration with its configuration.
 
         Args:
-            config: Integration-specific config from credentials.yaml
+            config: Integration-specific config from credentials.yaml, or an
+                already-validated ConfigModel instance (used as-is)
         """
         self._raw_config = config
         self._validated_config: Optional[IntegrationConfig] = None
+        self._config: Mapping[str, Any] = MappingProxyType({})
+        self._safe_config: Optional[Mapping[str, Any]] = None
         self._validate_config()
-        self._template_env: Optional[Environment] = None
 
     @property
-    def config(self) -> dict[str, Any]:
-        """Get config as a dict."""
+    def config(self) -> Mapping[str, Any]:
+        """Get config as a read-only mapping (built once at validation)."""
         if self._validated_config is None:
             raise RuntimeError(
                 f"Integration '{self.name}' config not validated. "
                 "This should not happen."
             )
-        return self._validated_config.model_dump()
+        return self._config
 
     def _validate_config(self) -> None:
         """Validate config against Pydantic model."""
@@ -104,18 +162,24 @@ class BaseIntegration(ABC):
                 "See IntegrationConfig in dashboard_integration_base.base"
             )
 
+        # ConfigModel instances pass through unchanged (pydantic's default
+        # revalidate_instances="never"), so pre-validated config is not re-parsed
         try:
-            self._validated_config = self.ConfigModel(**self._raw_config)
+            adapter = _config_adapter(self.ConfigModel)
+            self._validated_config = adapter.validate_python(self._raw_config)
+            # Dumped once so nested models reach templates as plain dicts
+            self._config = MappingProxyType(self._validated_config.model_dump())
         except ValidationError as e:
             raise ValueError(
                 f"Integration '{self.name}' config validation failed: {e}"
             ) from e
 
     def _get_template_env(self) -> Environment:
-        """Get Jinja2 environment for this integration's templates."""
-        if self._template_env is None:
-            # Find the module where this integration class is defined
-            module_name = self.__class__.__module__
+        """Get the Jinja2 environment shared by all instances of this class."""
+        # Find the module where this integration class is defined
+        module_name = self.__class__.__module__
+        env = self._template_env_cache.get(module_name)
+        if env is None:
             module = sys.modules.get(module_name)
 
             if (
@@ -130,10 +194,16 @@ class BaseIntegration(ABC):
 
             # Use the directory where the integration module is located
             template_dir = Path(module.__file__).parent
-            self._template_env = Environment(
-                loader=FileSystemLoader(str(template_dir)), autoescape=True
+            # auto_reload=False: compiled templates are reused without a
+            # stat per render, so edits to widget.html need a server restart
+            env = Environment(
+                loader=FileSystemLoader(str(template_dir)),
+                autoescape=True,
+                auto_reload=False,
+                bytecode_cache=_get_bytecode_cache(),
             )
-        return self._template_env
+            self._template_env_cache[module_name] = env
+        return env
 
     @abstractmethod
     async def fetch_data(self) -> dict[str, Any]:
@@ -175,38 +245,90 @@ class BaseIntegration(ABC):
         return
         yield  # pragma: no cover - make it an async generator
 
-    def _get_safe_config(self) -> dict[str, Any]:
+    def stop(self) -> None:
+        """
+        Optional: Ask a running event stream to finish.
+
+        Called on server shutdown before background tasks are cancelled.
+        Override if start_event_stream waits between checks and can end early.
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        Optional: Release long-lived resources such as HTTP clients.
+
+        Called once on server shutdown, after the integration's background
+        task has stopped. Override if the integration holds open connections.
+        """
+        return None
+
+    @classmethod
+    def _secret_field_names(cls) -> frozenset[str]:
+        """
+        Get names of ConfigModel fields marked with secret=True.
+
+        Read from the current ConfigModel, so a model assigned after the
+        class was defined is still filtered.
+
+        Returns:
+            Frozen set of secret field names
+        """
+        if cls.ConfigModel is None:  # pragma: no cover - validated in __init__
+            return frozenset()
+        return frozenset(
+            field_name
+            for field_name, field_info in cls.ConfigModel.model_fields.items()
+            if isinstance(field_info.json_schema_extra, dict)
+            and field_info.json_schema_extra.get("secret")
+        )
+
+    @classmethod
+    def _sensitive_key_pattern(cls) -> re.Pattern[str]:
+        """
+        Compile _sensitive_keys into a single case-insensitive regex.
+
+        One search per key replaces a lower() plus a substring scan per
+        sensitive word. Built from the current _sensitive_keys.
+
+        Returns:
+            Pattern matching any key that contains a sensitive word
+        """
+        return re.compile(
+            "|".join(re.escape(word) for word in sorted(cls._sensitive_keys)),
+            re.IGNORECASE,
+        )
+
+    def _get_safe_config(self) -> Mapping[str, Any]:
         """
         Get config with sensitive keys filtered out.
 
         For Pydantic models, also filters fields marked with secret=True
-        in json_schema_extra.
+        in json_schema_extra. Built on first use and reused afterwards,
+        since neither the config nor the secret keys change after init.
 
         Returns:
-            Config dict safe for template rendering
-        """
-        safe_config: dict[str, Any] = {}
-
-        # Get secret fields from Pydantic model if available
-        secret_fields: set[str] = set()
-        if (
-            self.ConfigModel is not None
-        ):  # pragma: no cover - branch unlikely with full test coverage
-            for field_name, field_info in self.ConfigModel.model_fields.items():
-                extra = field_info.json_schema_extra
-                if isinstance(extra, dict) and extra.get("secret"):
-                    secret_fields.add(field_name)
-
-        for key, value in self.config.items():
-            # Skip if marked as secret in Pydantic model
-            if key in secret_fields:
-                continue
-            # Skip if key contains sensitive patterns
-            if any(sensitive in key.lower() for sensitive in self._sensitive_keys):
-                continue
-            safe_config[key] = value
-
-        return safe_config
+            Read-only config mapping safe for template rendering
+        """
+        if self._safe_config is not None:
+            return self._safe_config
+
+        sensitive_pattern = self._sensitive_key_pattern()
+
+        # Drop Pydantic secret fields with one set difference, then keys
+        # that contain sensitive patterns
+        safe_keys = {
+            key
+            for key in self.config.keys() - self._secret_field_names()
+            if not sensitive_pattern.search(key)
+        }
+        # Rebuild from config to keep the original key order
+        safe_config = {
+            key: value for key, value in self.config.items() if key in safe_keys
+        }
+
+        self._safe_config = MappingProxyType(safe_config)
+        return self._safe_config
 
     def render_widget(self, data: dict[str, Any]) -> str:
         """
@@ -221,8 +343,7 @@ class BaseIntegration(ABC):
         Returns:
             Rendered HTML string
         """
-        env = self._get_template_env()
-        template = env.get_template("widget.html")
+        template = self._get_template_env().get_template("widget.html")
         return template.render(data=data, config=self._get_safe_config())
 
     def get_config_value(self, key: str, default: Any = None) -> Any:
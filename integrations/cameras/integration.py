@@ -140,6 +140,16 @@ class UniFiProtectIntegration(BaseIntegration):
 
         self._initialized = True
 
+    async def close(self) -> None:
+        """Close the UniFi Protect and go2rtc clients."""
+        if self._unifi_client is not None:
+            await self._unifi_client.close()
+            self._unifi_client = None
+        if self._go2rtc_client is not None:
+            await self._go2rtc_client.close()
+            self._go2rtc_client = None
+        self._initialized = False
+
     async def _register_camera_streams(self) -> None:
         """Register all camera streams with go2rtc.
 
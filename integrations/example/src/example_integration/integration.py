@@ -6,8 +6,10 @@ creating new integrations. It shows all required methods and
 common patterns.
 """
 
+import time
 from collections import deque
 from datetime import datetime
+from functools import cache
 from typing import Any
 
 import psutil
@@ -24,6 +26,73 @@ class ExampleConfig(IntegrationConfig):
     message: str = "Welcome to Dashboard"
 
 
+class RollingSum:
+    """Fixed-size window of samples with a running total for O(1) averages."""
+
+    def __init__(self, maxlen: int) -> None:
+        """Create an empty window holding at most maxlen samples."""
+        self._values: deque[float] = deque(maxlen=maxlen)
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        """Number of samples currently in the window."""
+        return len(self._values)
+
+    def append(self, value: float) -> None:
+        """Add a sample, evicting the oldest one when the window is full."""
+        if len(self._values) == self._values.maxlen:
+            self.total -= self._values[0]
+        self._values.append(value)
+        self.total += value
+
+
+class SystemSampler:
+    """
+    Process-wide system metrics shared by all ExampleIntegration instances.
+
+    Readings are refreshed at most once per min_interval seconds, so any
+    number of widgets polling fetch_data() costs a single set of psutil calls.
+    """
+
+    def __init__(self, min_interval: float = 1.0) -> None:
+        """Create a sampler; nothing is read until the first sample()."""
+        self._min_interval = min_interval
+        self._sampled_at: float | None = None
+        self.cpu = 0.0
+        self.memory = 0.0
+        self.temp = 0.0
+
+    def sample(self) -> None:
+        """Refresh readings unless they are newer than min_interval."""
+        now = time.monotonic()
+        if self._sampled_at is not None and now - self._sampled_at < self._min_interval:
+            return
+        # The first reading blocks briefly for a real measurement; later ones
+        # measure CPU since the previous sample without blocking
+        interval = 0.1 if self._sampled_at is None else None
+        self._sampled_at = now
+
+        self.cpu = psutil.cpu_percent(interval=interval)
+        self.memory = psutil.virtual_memory().percent
+
+        # Try to get temperature (may not be available on all systems)
+        try:
+            temps = psutil.sensors_temperatures()
+            if temps:  # pragma: no cover - requires hardware temp sensors
+                # Get first available temperature sensor
+                first_sensor = next(iter(temps.values()))
+                self.temp = first_sensor[0].current if first_sensor else 0.0
+        except (AttributeError, OSError):
+            # Temperature not available on this system
+            pass
+
+
+@cache
+def _get_sampler() -> SystemSampler:
+    """Get the shared sampler, created on first use so import has no side effects."""
+    return SystemSampler()
+
+
 class ExampleIntegration(BaseIntegration):
     """
     Example integration that displays current time and system stats.
@@ -42,15 +111,15 @@ class ExampleIntegration(BaseIntegration):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize with rolling average buffers (180 samples = 3 minutes)."""
         super().__init__(*args, **kwargs)
-        self._cpu_history: deque[float] = deque(maxlen=180)
-        self._memory_history: deque[float] = deque(maxlen=180)
-        self._temp_history: deque[float] = deque(maxlen=180)
+        self._cpu_history = RollingSum(maxlen=180)
+        self._memory_history = RollingSum(maxlen=180)
+        self._temp_history = RollingSum(maxlen=180)
 
-    def _get_rolling_average(self, history: deque[float]) -> float:
-        """Calculate rolling average from history."""
+    def _get_rolling_average(self, history: RollingSum) -> float:
+        """Calculate rolling average from history's running total."""
         if not history:
             return 0.0
-        return sum(history) / len(history)
+        return history.total / len(history)
 
     async def fetch_data(self) -> dict[str, Any]:
         """
@@ -59,25 +128,14 @@ class ExampleIntegration(BaseIntegration):
         Returns:
             Dict with current time, date, and 3-minute averaged system stats
         """
-        # Get current system metrics
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory_percent = psutil.virtual_memory().percent
-
-        # Try to get temperature (may not be available on all systems)
-        temp = 0.0
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:  # pragma: no cover - requires hardware temp sensors
-                # Get first available temperature sensor
-                first_sensor = next(iter(temps.values()))
-                temp = first_sensor[0].current if first_sensor else 0.0
-        except (AttributeError, OSError):
-            # Temperature not available on this system
-            pass
+        # Get current system metrics (shared across instances)
+        sampler = _get_sampler()
+        sampler.sample()
+        temp = sampler.temp
 
         # Add to rolling history
-        self._cpu_history.append(cpu_percent)
-        self._memory_history.append(memory_percent)
+        self._cpu_history.append(sampler.cpu)
+        self._memory_history.append(sampler.memory)
         if temp > 0:  # pragma: no cover - requires hardware temp sensors
             self._temp_history.append(temp)
 
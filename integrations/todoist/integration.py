@@ -7,12 +7,13 @@ near real-time updates.
 """
 
 import asyncio
-import json
 import logging
+import random
 from datetime import datetime, timedelta
 from typing import Any, AsyncIterator, Optional
 
 import httpx
+import orjson
 from dashboard_integration_base import BaseIntegration, IntegrationConfig
 from pydantic import Field
 from todoist_api_python.api_async import TodoistAPIAsync
@@ -20,6 +21,11 @@ from todoist_api_python.api_async import TodoistAPIAsync
 logger = logging.getLogger(__name__)
 
 SYNC_API_URL = "https://api.todoist.com/api/v1/sync"
+# Sync resources polled for changes, JSON-encoded once for the form body
+SYNC_RESOURCE_TYPES = orjson.dumps(["items", "projects"]).decode()
+
+# Upper bound in seconds for the sync retry backoff
+BACKOFF_CAP = 300.0
 
 
 class TodoistConfig(IntegrationConfig):
@@ -42,6 +48,10 @@ class TodoistConfig(IntegrationConfig):
         default=5,
         description="Sync API poll interval in seconds for real-time updates",
     )
+    timeout_seconds: float = Field(
+        default=10.0,
+        description="Deadline in seconds for each Todoist HTTP request and sync check",
+    )
     work_parent_project: str = Field(
         default="",
         description="Parent project name - all sub-projects will be shown with hours tracking",
@@ -73,7 +83,9 @@ class TodoistIntegration(BaseIntegration):
         """Initialize Todoist integration."""
         super().__init__(*args, **kwargs)
         self._api: Optional[TodoistAPIAsync] = None
+        self._client: Optional[httpx.AsyncClient] = None
         self._sync_token: str = "*"  # Start with full sync  # nosec B105
+        self._stopping = asyncio.Event()
 
     def _get_api(self) -> TodoistAPIAsync:
         """Get or create Todoist API client."""
@@ -82,6 +94,50 @@ class TodoistIntegration(BaseIntegration):
             self._api = TodoistAPIAsync(api_token)
         return self._api
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client shared by Sync and completed-task calls."""
+        # One pooled client keeps the TLS connection alive between polls. The
+        # pool also caps in-flight requests; extra callers queue for a free
+        # connection until the pool timeout.
+        if self._client is None:
+            timeout = self.get_config_value("timeout_seconds")
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout, connect=3.0),
+                limits=httpx.Limits(
+                    max_connections=4,
+                    max_keepalive_connections=4,
+                    keepalive_expiry=60,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stop(self) -> None:
+        """Ask a running event stream to finish after its current check."""
+        self._stopping.set()
+
+    async def _wait_for_stop(self, delay: float) -> bool:
+        """
+        Wait up to delay seconds, waking early if stop() is called.
+
+        Args:
+            delay: Seconds to wait
+
+        Returns:
+            True if the stream has been asked to stop
+        """
+        try:
+            async with asyncio.timeout(delay):
+                await self._stopping.wait()
+        except TimeoutError:
+            pass
+        return self._stopping.is_set()
+
     async def fetch_data(self) -> dict[str, Any]:
         """
         Fetch task data from Todoist API.
@@ -238,65 +294,61 @@ class TodoistIntegration(BaseIntegration):
             daily_counts[day] = 0
 
         try:
-            async with httpx.AsyncClient() as client:
-                # Use Todoist API v1 which returns duration directly
-                all_items = await self._fetch_all_completed_pages(
-                    client, api_token, fetch_since, today
-                )
-
-                today_tasks = []
-                billing_tasks = []
-                today_str = today.isoformat()
-                billing_start_str = billing_start.isoformat()
-
-                logger.debug(f"API v1 returned {len(all_items)} completed items")
-
-                for item in all_items:
-                    completed_at = item.get("completed_at", "")
-                    if not completed_at:
-                        continue
-
-                    # Extract date from ISO timestamp
-                    completed_date = completed_at[:10]
-                    if completed_date in daily_counts:
-                        daily_counts[completed_date] += 1
-
-                    task_dict = {
-                        "id": item.get("id"),
-                        "content": item.get("content", ""),
-                        "project_id": item.get("project_id"),
-                        "project_name": project_map.get(item.get("project_id", ""), ""),
-                        "duration": item.get("duration"),
-                        "completed_at": completed_at,
-                    }
+            client = self._get_client()
+            # Use Todoist API v1 which returns duration directly
+            all_items = await self._fetch_all_completed_pages(
+                client, api_token, fetch_since, today
+            )
 
-                    # Collect today's tasks for the list
-                    if completed_date == today_str:
-                        today_tasks.append(task_dict)
-
-                    # Collect all billing period tasks for hours tracking
-                    if completed_date >= billing_start_str:
-                        billing_tasks.append(task_dict)
-
-                # Sort tasks by completion time, most recent first
-                today_tasks.sort(
-                    key=lambda t: t.get("completed_at") or "", reverse=True
-                )
-                billing_tasks.sort(
-                    key=lambda t: t.get("completed_at") or "", reverse=True
-                )
-
-                # Build sparkline data
-                counts = [daily_counts[d] for d in sorted(daily_counts.keys())]
-                max_count = max(counts) if counts else 0
-                sparkline = {
-                    "counts": counts,
-                    "max": max_count,
-                    "total": sum(counts),
-                    "bars": self._counts_to_sparkline(counts),
+            today_tasks = []
+            billing_tasks = []
+            today_str = today.isoformat()
+            billing_start_str = billing_start.isoformat()
+
+            logger.debug(f"API v1 returned {len(all_items)} completed items")
+
+            for item in all_items:
+                completed_at = item.get("completed_at", "")
+                if not completed_at:
+                    continue
+
+                # Extract date from ISO timestamp
+                completed_date = completed_at[:10]
+                if completed_date in daily_counts:
+                    daily_counts[completed_date] += 1
+
+                task_dict = {
+                    "id": item.get("id"),
+                    "content": item.get("content", ""),
+                    "project_id": item.get("project_id"),
+                    "project_name": project_map.get(item.get("project_id", ""), ""),
+                    "duration": item.get("duration"),
+                    "completed_at": completed_at,
                 }
 
-                return today_tasks, billing_tasks, sparkline
+                # Collect today's tasks for the list
+                if completed_date == today_str:
+                    today_tasks.append(task_dict)
+
+                # Collect all billing period tasks for hours tracking
+                if completed_date >= billing_start_str:
+                    billing_tasks.append(task_dict)
+
+            # Sort tasks by completion time, most recent first
+            today_tasks.sort(key=lambda t: t.get("completed_at") or "", reverse=True)
+            billing_tasks.sort(key=lambda t: t.get("completed_at") or "", reverse=True)
+
+            # Build sparkline data
+            counts = [daily_counts[d] for d in sorted(daily_counts.keys())]
+            max_count = max(counts) if counts else 0
+            sparkline = {
+                "counts": counts,
+                "max": max_count,
+                "total": sum(counts),
+                "bars": self._counts_to_sparkline(counts),
+            }
+
+            return today_tasks, billing_tasks, sparkline
 
         except Exception as e:
             logger.warning(f"Failed to fetch completed tasks: {e}")
@@ -343,10 +395,9 @@ class TodoistIntegration(BaseIntegration):
                 "https://api.todoist.com/api/v1/tasks/completed/by_completion_date",
                 headers={"Authorization": f"Bearer {api_token}"},
                 params=params,
-                timeout=30.0,
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
             items = data.get("items", [])
             all_items.extend(items)
@@ -511,13 +562,22 @@ class TodoistIntegration(BaseIntegration):
             headers={"Authorization": f"Bearer {api_token}"},
             data={
                 "sync_token": self._sync_token,
-                "resource_types": json.dumps(["items", "projects"]),
+                "resource_types": SYNC_RESOURCE_TYPES,
             },
-            timeout=30.0,
         )
         response.raise_for_status()
-        data = response.json()
+        return self._diff_sync_response(orjson.loads(response.content))
+
+    def _diff_sync_response(self, data: dict[str, Any]) -> tuple[bool, str]:
+        """
+        Decide whether a Sync API response carries task or project changes.
+
+        Args:
+            data: Parsed Sync API response body
 
+        Returns:
+            Tuple of (has_changes, new_sync_token)
+        """
         new_token = data.get("sync_token", self._sync_token)
         is_full_sync = data.get("full_sync", False)
 
@@ -540,7 +600,7 @@ class TodoistIntegration(BaseIntegration):
 
         Uses incremental sync tokens to detect changes quickly without
         fetching all data on every poll. Only yields updates when
-        tasks or projects have actually changed.
+        tasks or projects have actually changed. Ends once stop() is called.
         """
         poll_interval = self.get_config_value("poll_interval", 5)
         logger.info(
@@ -549,34 +609,59 @@ class TodoistIntegration(BaseIntegration):
 
         # Reset sync token for fresh start ("*" is Todoist's documented initial sync token)
         self._sync_token = "*"  # nosec B105
+        self._stopping.clear()
 
-        async with httpx.AsyncClient() as client:
-            # Initial sync - always yield first data
-            try:
+        client = self._get_client()
+        timeout = self.get_config_value("timeout_seconds")
+        # Initial sync - always yield first data
+        try:
+            async with asyncio.timeout(timeout):
                 has_changes, new_token = await self._check_for_changes(client)
+            self._sync_token = new_token
+            yield await self.fetch_data()
+        except Exception as e:
+            logger.error(f"Todoist initial sync failed: {e}")
+            raise
+
+        # Continuous polling for changes; after a failure the next wait is
+        # the jittered backoff instead of the poll interval
+        failures = 0
+        delay = poll_interval
+        while not await self._wait_for_stop(delay):
+            try:
+                # Bound the whole check, not just each socket operation
+                async with asyncio.timeout(timeout):
+                    has_changes, new_token = await self._check_for_changes(client)
                 self._sync_token = new_token
-                yield await self.fetch_data()
+                failures = 0
+                delay = poll_interval
+
+                if has_changes:
+                    logger.debug("Todoist pushing update due to changes")
+                    yield await self.fetch_data()
+
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Todoist sync API error: {e.response.status_code}")
+                # A rejected token will not fix itself - stop instead of retrying
+                if e.response.status_code == 401:
+                    raise
+                failures += 1
+                delay = self._backoff_delay(poll_interval, failures)
             except Exception as e:
-                logger.error(f"Todoist initial sync failed: {e}")
-                raise
+                logger.error(f"Todoist sync error: {e}")
+                failures += 1
+                delay = self._backoff_delay(poll_interval, failures)
 
-            # Continuous polling for changes
-            while True:
-                await asyncio.sleep(poll_interval)
+    def _backoff_delay(self, base: float, failures: int) -> float:
+        """
+        Exponential backoff with full jitter for consecutive sync failures.
 
-                try:
-                    has_changes, new_token = await self._check_for_changes(client)
-                    self._sync_token = new_token
-
-                    if has_changes:
-                        logger.debug("Todoist pushing update due to changes")
-                        yield await self.fetch_data()
-
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"Todoist sync API error: {e.response.status_code}")
-                    # On auth errors, don't keep retrying rapidly
-                    if e.response.status_code in (401, 403):
-                        await asyncio.sleep(60)
-                except Exception as e:
-                    logger.error(f"Todoist sync error: {e}")
-                    await asyncio.sleep(poll_interval)
+        Args:
+            base: Delay ceiling after the first failure (the poll interval)
+            failures: Number of consecutive failures so far (>= 1)
+
+        Returns:
+            Random delay between 0 and min(BACKOFF_CAP, base * 2**(failures - 1))
+        """
+        ceiling = min(BACKOFF_CAP, base * 2 ** (failures - 1))
+        return random.uniform(0, ceiling)  # nosec B311 - jitter, not crypto
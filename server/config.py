@@ -5,6 +5,7 @@ Provides type-safe configuration with YAML file support and
 environment variable overrides for 12-factor app compliance.
 """
 
+import asyncio
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
@@ -117,10 +118,12 @@ def get_settings() -> AppSettings:
 def _get_credentials_data() -> dict[str, Any]:
     """Load raw credentials from YAML file (cached)."""
     creds_file = get_config_dir() / "credentials.yaml"
-    if creds_file.exists():
+    # Single open() instead of exists() + open() - saves a stat per load
+    try:
         with open(creds_file) as f:
             return yaml.safe_load(f) or {}
-    return {}
+    except FileNotFoundError:
+        return {}
 
 
 def get_credentials(integration_name: str) -> dict[str, Any]:
@@ -151,6 +154,19 @@ def get_credentials(integration_name: str) -> dict[str, Any]:
     return creds
 
 
+async def preload_settings() -> None:
+    """
+    Load config.yaml and credentials.yaml concurrently (warms both caches).
+
+    Each file is read and parsed in a worker thread so the two reads
+    overlap instead of running back to back on startup.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(get_settings),
+        asyncio.to_thread(_get_credentials_data),
+    )
+
+
 def reload_settings() -> None:
     """Force reload all settings."""
     get_settings.cache_clear()
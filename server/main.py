@@ -20,7 +20,7 @@ from jinja2 import Environment, FileSystemLoader
 
 from integrations import discover_integrations, load_integration
 from integrations.base import BaseIntegration
-from server.config import get_credentials, get_settings
+from server.config import get_credentials, get_settings, preload_settings
 from server.themes import get_theme
 
 logger = logging.getLogger(__name__)
@@ -35,6 +35,9 @@ loaded_integrations: dict[str, BaseIntegration] = {}
 # Background tasks
 background_tasks: set[asyncio.Task[None]] = set()
 
+# Seconds a stopped event stream gets to return before it is cancelled
+SHUTDOWN_GRACE_SECONDS = 2.0
+
 
 def hex_to_rgb(hex_color: str) -> str:
     """
@@ -116,9 +119,21 @@ async def refresh_widget(integration: BaseIntegration) -> None:
             await broadcast_widget_update(integration.name, html)
 
             # Continue streaming events
-            async for data in event_stream:
-                html = integration.render_widget(data)
-                await broadcast_widget_update(integration.name, html)
+            try:
+                async for data in event_stream:
+                    html = integration.render_widget(data)
+                    await broadcast_widget_update(integration.name, html)
+            except Exception:
+                # Streams only raise on errors they cannot retry (e.g. a
+                # rejected token), so stop updating and show the widget as failed
+                logger.exception(
+                    "%s event stream failed, widget updates stopped",
+                    integration.name,
+                )
+                await broadcast_widget_update(
+                    integration.name,
+                    f'<div class="text-red-500">Error updating {integration.name}</div>',
+                )
 
         except StopAsyncIteration:
             # Event stream ended, shouldn't happen for infinite streams
@@ -178,21 +193,40 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     global loaded_integrations
 
     # Load integrations on startup
+    await preload_settings()
     loaded_integrations = load_all_integrations()
     logger.info("Loaded %d integration(s)", len(loaded_integrations))
 
     # Start background refresh tasks
+    stoppable_tasks: set[asyncio.Task[None]] = set()
     for integration in loaded_integrations.values():
         task = asyncio.create_task(refresh_widget(integration))
         background_tasks.add(task)
+        if type(integration).stop is not BaseIntegration.stop:
+            stoppable_tasks.add(task)
 
     yield
 
-    # Cancel all background tasks on shutdown
+    # Ask event streams to finish and give those that implement stop() a
+    # bounded grace period to return on their own
+    for integration in loaded_integrations.values():
+        integration.stop()
+    if stoppable_tasks:
+        await asyncio.wait(stoppable_tasks, timeout=SHUTDOWN_GRACE_SECONDS)
+
+    # Cancel the stragglers (including polling loops) and let them unwind
     for task in background_tasks:
         task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
     background_tasks.clear()
 
+    # Then release integration clients, which no task is using any more
+    for integration in loaded_integrations.values():
+        try:
+            await integration.close()
+        except Exception:
+            logger.exception("Error closing %s", integration.name)
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
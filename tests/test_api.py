@@ -327,6 +327,108 @@ class TestDashboardWithoutStaticFiles:
         assert app is not None
 
 
+class TestLifespan:
+    """Tests for the application lifespan handler."""
+
+    def test_shutdown_closes_integrations(self, setup_config, monkeypatch):
+        """Test that shutdown closes every loaded integration."""
+        from dashboard_integration_base import BaseIntegration
+
+        closed = []
+
+        async def mock_close(self):
+            closed.append(self.name)
+
+        monkeypatch.setattr(BaseIntegration, "close", mock_close)
+
+        with TestClient(app):
+            assert closed == []
+
+        assert closed == ["example"]
+
+    def test_shutdown_stops_integrations_before_closing(
+        self, setup_config, monkeypatch
+    ):
+        """Test that shutdown asks every integration to stop before close()."""
+        from dashboard_integration_base import BaseIntegration
+
+        calls = []
+
+        def mock_stop(self):
+            calls.append(("stop", self.name))
+
+        async def mock_close(self):
+            calls.append(("close", self.name))
+
+        monkeypatch.setattr(BaseIntegration, "stop", mock_stop)
+        monkeypatch.setattr(BaseIntegration, "close", mock_close)
+
+        with TestClient(app):
+            assert calls == []
+
+        assert calls == [("stop", "example"), ("close", "example")]
+
+    async def test_shutdown_lets_stopped_stream_return(self, monkeypatch):
+        """Test a stream that honours stop() returns instead of being cancelled."""
+        import asyncio
+        from typing import Any, AsyncIterator
+        from unittest.mock import AsyncMock
+
+        import server.main as main
+        from integrations.base import BaseIntegration, IntegrationConfig
+
+        class TestConfig(IntegrationConfig):
+            pass
+
+        class StoppableIntegration(BaseIntegration):
+            name = "stoppable"
+            display_name = "Stoppable"
+            ConfigModel = TestConfig
+
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                self._stopping = asyncio.Event()
+
+            def stop(self) -> None:
+                self._stopping.set()
+
+            async def fetch_data(self) -> dict[str, Any]:
+                return {}
+
+            async def start_event_stream(self) -> AsyncIterator[dict[str, Any]]:
+                yield {}
+                await self._stopping.wait()
+
+        integration = StoppableIntegration({})
+        monkeypatch.setattr(integration, "render_widget", lambda data: "")
+        monkeypatch.setattr(main, "preload_settings", AsyncMock())
+        monkeypatch.setattr(
+            main, "load_all_integrations", lambda: {"stoppable": integration}
+        )
+
+        async with main.lifespan(main.app):
+            (task,) = main.background_tasks
+            # Let the stream yield its first update and wait for stop()
+            await asyncio.sleep(0.01)
+
+        assert task.done()
+        assert not task.cancelled()
+
+    def test_shutdown_logs_close_errors(self, setup_config, monkeypatch, caplog):
+        """Test that a failing close() is logged without breaking shutdown."""
+        from dashboard_integration_base import BaseIntegration
+
+        async def failing_close(self):
+            raise RuntimeError("close failed")
+
+        monkeypatch.setattr(BaseIntegration, "close", failing_close)
+
+        with TestClient(app):
+            pass
+
+        assert "Error closing example" in caplog.text
+
+
 class TestWebSocketHandling:
     """Tests for WebSocket edge cases."""
 
@@ -456,6 +558,50 @@ class TestRefreshWidgetPollingMode:
         # Should have broadcast the initial data and 2 events
         assert len(broadcast_calls) >= 2
 
+    @pytest.mark.asyncio
+    async def test_refresh_widget_event_stream_error(self, monkeypatch, caplog):
+        """Test a failing event stream is logged and the widget shown as failed."""
+        from typing import Any, AsyncIterator
+
+        from integrations.base import BaseIntegration, IntegrationConfig
+        from server.main import refresh_widget
+
+        class TestConfig(IntegrationConfig):
+            pass
+
+        class FailingStreamIntegration(BaseIntegration):
+            name = "failing_stream"
+            display_name = "Failing Stream"
+            ConfigModel = TestConfig
+
+            async def fetch_data(self) -> dict[str, Any]:
+                return {}
+
+            async def start_event_stream(self) -> AsyncIterator[dict[str, Any]]:
+                yield {"data": 1}
+                raise RuntimeError("token rejected")
+
+        integration = FailingStreamIntegration({})
+        monkeypatch.setattr(
+            integration, "render_widget", lambda data: "<div>rendered</div>"
+        )
+
+        broadcasts = []
+
+        async def mock_broadcast(name, html):
+            broadcasts.append(html)
+
+        monkeypatch.setattr("server.main.broadcast_widget_update", mock_broadcast)
+
+        # Returns instead of raising out of the background task
+        await refresh_widget(integration)
+
+        assert broadcasts == [
+            "<div>rendered</div>",
+            '<div class="text-red-500">Error updating failing_stream</div>',
+        ]
+        assert "failing_stream event stream failed" in caplog.text
+
     @pytest.mark.asyncio
     async def test_refresh_widget_polling_mode(self, monkeypatch):
         """Test refresh_widget falls back to polling mode when event stream raises TypeError."""
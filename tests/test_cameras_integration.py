@@ -883,6 +883,41 @@ class TestUniFiProtectIntegration:
         # Should return early without reinitializing
         assert integration._unifi_client is mock_unifi
 
+    async def test_close(self):
+        """Test that close releases both clients."""
+        config = {
+            "host": "https://unifi.local",
+            "username": "admin",
+            "password": "password",
+        }
+        integration = UniFiProtectIntegration(config)
+        mock_unifi = AsyncMock()
+        mock_go2rtc = AsyncMock()
+        integration._unifi_client = mock_unifi
+        integration._go2rtc_client = mock_go2rtc
+        integration._initialized = True
+
+        await integration.close()
+
+        mock_unifi.close.assert_awaited_once()
+        mock_go2rtc.close.assert_awaited_once()
+        assert integration._unifi_client is None
+        assert integration._go2rtc_client is None
+        assert integration._initialized is False
+
+    async def test_close_without_clients(self):
+        """Test close before the clients were initialized."""
+        config = {
+            "host": "https://unifi.local",
+            "username": "admin",
+            "password": "password",
+        }
+        integration = UniFiProtectIntegration(config)
+
+        await integration.close()
+
+        assert integration._initialized is False
+
     async def test_register_camera_streams_success(self):
         """Test successful stream registration."""
         config = {
@@ -9,6 +9,7 @@ from server.config import (
     AppSettings,
     get_credentials,
     get_settings,
+    preload_settings,
     reload_settings,
     set_config_dir,
 )
@@ -69,6 +70,21 @@ class TestGetSettings:
             set_config_dir(None)
 
 
+class TestPreloadSettings:
+    """Tests for preload_settings function."""
+
+    async def test_preload_warms_both_caches(self, setup_config: Path):
+        """Test that preload_settings loads settings and credentials."""
+        from server.config import _get_credentials_data
+
+        await preload_settings()
+
+        assert get_settings.cache_info().currsize == 1
+        assert _get_credentials_data.cache_info().currsize == 1
+        assert get_settings().dashboard.title == "Test Dashboard"
+        assert get_credentials("example")["api_key"] == "test-secret-key"
+
+
 class TestGetCredentials:
     """Tests for get_credentials function."""
 
@@ -1,10 +1,21 @@
 """Tests for integration discovery and base class."""
 
+import importlib
+from collections.abc import Callable, Mapping
+from types import ModuleType, SimpleNamespace
+from typing import Any
+
+import dashboard_integration_base.base as base_module
+import example_integration.integration as example_module
+import psutil
 import pytest
+from example_integration.integration import RollingSum, SystemSampler
 from pydantic import Field
 
+import integrations
 from integrations import discover_integrations, load_integration
 from integrations.base import BaseIntegration, IntegrationConfig
+from integrations.example import ExampleIntegration
 
 
 class MockIntegrationConfig(IntegrationConfig):
@@ -27,6 +38,108 @@ class MockIntegration(BaseIntegration):
         return {"status": "ok", "url": self.config.get("url")}
 
 
+class StrictConfig(IntegrationConfig):
+    """Config with a required secret field."""
+
+    api_key: str = Field(..., json_schema_extra={"secret": True})
+
+
+class StrictIntegration(BaseIntegration):
+    """Integration whose config requires api_key."""
+
+    name = "strict"
+    display_name = "Strict"
+    ConfigModel = StrictConfig
+
+    async def fetch_data(self):
+        return {}
+
+
+class SecretConfig(IntegrationConfig):
+    """Config with one secret and one public field."""
+
+    api_key: str = Field(default="secret", json_schema_extra={"secret": True})
+    public_url: str = Field(default="https://example.com")
+
+
+class SecretIntegration(BaseIntegration):
+    """Integration for secret-field filtering tests."""
+
+    name = "secret"
+    display_name = "Secret"
+    ConfigModel = SecretConfig
+
+    async def fetch_data(self):
+        return {}
+
+
+class FakeIntegrationConfig(IntegrationConfig):
+    """Empty config for FakeModuleIntegration."""
+
+
+class FakeModuleIntegration(BaseIntegration):
+    """Integration whose module cannot be located."""
+
+    name = "fake"
+    display_name = "Fake"
+    ConfigModel = FakeIntegrationConfig
+    # Module name that doesn't exist, so no template directory can be found
+    __module__ = "nonexistent_module_xyz"
+
+    async def fetch_data(self):
+        return {}
+
+
+class MyConfig(IntegrationConfig):
+    """Config with defaults for get_config_value tests."""
+
+    api_key: str = "default-key"
+    timeout: int = 30
+
+
+class PydanticIntegration(BaseIntegration):
+    """Integration for get_config_value tests."""
+
+    name = "pydantic"
+    display_name = "Pydantic"
+    ConfigModel = MyConfig
+
+    async def fetch_data(self):
+        return {}
+
+
+class NestedConfig(IntegrationConfig):
+    """Config with a nested model field."""
+
+    url: str = "https://example.com"
+    inner: MockIntegrationConfig
+
+
+class NestedIntegration(BaseIntegration):
+    """Integration for nested config tests."""
+
+    name = "nested"
+    display_name = "Nested"
+    ConfigModel = NestedConfig
+
+    async def fetch_data(self):
+        return {}
+
+
+@pytest.fixture
+def mock_integration_factory() -> Callable[[dict[str, Any]], MockIntegration]:
+    """Factory for a MockIntegration from a trusted inline config.
+
+    Configs go through model_construct, so only tests that do not check
+    init or validation behaviour should use it; those pass raw dicts.
+    """
+
+    def factory(config: dict[str, Any]) -> MockIntegration:
+        return MockIntegration(MockIntegrationConfig.model_construct(**config))
+
+    return factory
+
+
 class TestBaseIntegration:
     """Tests for BaseIntegration class."""
 
@@ -40,6 +153,11 @@ class TestBaseIntegration:
         assert integration.config["api_key"] == "secret123"
         assert integration.config["timeout"] == 30  # Default value
         assert integration.name == "mock"
+
+        # Config is dumped once into a read-only mapping
+        assert integration.config is integration.config
+        with pytest.raises(TypeError):
+            integration.config["url"] = "https://changed.example.com"  # type: ignore[index]
         assert integration.display_name == "Mock Integration"
 
     def test_init_missing_required_field(self):
@@ -49,6 +167,42 @@ class TestBaseIntegration:
         with pytest.raises(ValueError, match="config validation failed"):
             MockIntegration(config)
 
+    def test_config_adapter_built_per_model(self):
+        """Test that the ConfigModel validator is built once per model class."""
+        adapter = base_module._config_adapter(MockIntegrationConfig)
+        assert base_module._config_adapter(MockIntegrationConfig) is adapter
+
+        # A subclassed model gets its own validator, not the parent's
+        class SubConfig(MockIntegrationConfig):
+            pass
+
+        assert base_module._config_adapter(SubConfig) is not adapter
+        assert isinstance(
+            base_module._config_adapter(SubConfig).validate_python({"url": "u"}),
+            SubConfig,
+        )
+
+        integration = MockIntegration({"url": "https://example.com"})
+        assert isinstance(integration._validated_config, MockIntegrationConfig)
+
+    def test_config_adapter_follows_patched_config_model(self, monkeypatch):
+        """Test that a ConfigModel replaced after class creation is validated."""
+        monkeypatch.setattr(MockIntegration, "ConfigModel", StrictConfig)
+
+        with pytest.raises(ValueError, match="config validation failed"):
+            MockIntegration({"url": "https://example.com"})
+
+        integration = MockIntegration({"api_key": "secret"})
+        assert isinstance(integration._validated_config, StrictConfig)
+
+    def test_init_with_validated_model_skips_revalidation(self):
+        """Test that a ConfigModel instance is used as-is."""
+        model = MockIntegrationConfig(url="https://example.com")
+        integration = MockIntegration(model)
+
+        assert integration._validated_config is model
+        assert integration.config["url"] == "https://example.com"
+
     def test_get_config_value(self):
         """Test getting config values with defaults."""
         config = {"url": "https://example.com"}
@@ -58,7 +212,7 @@ class TestBaseIntegration:
         assert integration.get_config_value("timeout") == 30  # From schema default
         assert integration.get_config_value("nonexistent", "fallback") == "fallback"
 
-    def test_sensitive_keys_filtered(self):
+    def test_sensitive_keys_filtered(self, mock_integration_factory):
         """Test that sensitive keys are filtered from template config."""
         config = {
             "url": "https://example.com",
@@ -67,19 +221,20 @@ class TestBaseIntegration:
             "password": "secret-pass",
             "display_name": "My Widget",
         }
-        integration = MockIntegration(config)
+        integration = mock_integration_factory(config)
         safe_config = integration._get_safe_config()
 
         # Sensitive keys should be filtered
-        assert "api_key" not in safe_config
-        assert "token" not in safe_config
-        assert "password" not in safe_config
+        assert not MockIntegration._sensitive_keys & safe_config.keys()
 
         # Non-sensitive keys should remain
         assert safe_config["url"] == "https://example.com"
         assert safe_config["display_name"] == "My Widget"
 
-    def test_sensitive_keys_case_insensitive(self):
+        # Filtered config is built once and reused
+        assert integration._get_safe_config() is safe_config
+
+    def test_sensitive_keys_case_insensitive(self, mock_integration_factory):
         """Test that sensitive key filtering is case-insensitive."""
         config = {
             "url": "https://example.com",
@@ -87,7 +242,7 @@ class TestBaseIntegration:
             "access_token": "token123",
             "my_secret_value": "hidden",
         }
-        integration = MockIntegration(config)
+        integration = mock_integration_factory(config)
         safe_config = integration._get_safe_config()
 
         assert "API_KEY" not in safe_config
@@ -95,10 +250,10 @@ class TestBaseIntegration:
         assert "my_secret_value" not in safe_config
         assert safe_config["url"] == "https://example.com"
 
-    async def test_fetch_data(self):
+    async def test_fetch_data(self, mock_integration_factory):
         """Test fetch_data returns expected data."""
         config = {"url": "https://example.com"}
-        integration = MockIntegration(config)
+        integration = mock_integration_factory(config)
 
         data = await integration.fetch_data()
 
@@ -107,37 +262,12 @@ class TestBaseIntegration:
 
     def test_pydantic_config_validation_error(self):
         """Test that Pydantic validation errors are caught."""
-
-        class StrictConfig(IntegrationConfig):
-            api_key: str = Field(..., json_schema_extra={"secret": True})
-
-        class StrictIntegration(BaseIntegration):
-            name = "strict"
-            display_name = "Strict"
-            ConfigModel = StrictConfig
-
-            async def fetch_data(self):
-                return {}
-
         # Missing required api_key
         with pytest.raises(ValueError, match="config validation failed"):
             StrictIntegration({})
 
     def test_secret_fields_from_pydantic_config(self):
         """Test that secret fields in Pydantic config are filtered."""
-
-        class SecretConfig(IntegrationConfig):
-            api_key: str = Field(default="secret", json_schema_extra={"secret": True})
-            public_url: str = Field(default="https://example.com")
-
-        class SecretIntegration(BaseIntegration):
-            name = "secret"
-            display_name = "Secret"
-            ConfigModel = SecretConfig
-
-            async def fetch_data(self):
-                return {}
-
         integration = SecretIntegration(
             {"api_key": "my-secret", "public_url": "https://api.example.com"}
         )
@@ -148,34 +278,40 @@ class TestBaseIntegration:
         # Public field should remain
         assert safe_config["public_url"] == "https://api.example.com"
 
-    def test_template_env_missing_module(self):
-        """Test error when integration module cannot be found."""
+        assert SecretIntegration._secret_field_names() == frozenset({"api_key"})
 
-        # Create an integration with a fake module
-        class FakeIntegrationConfig(IntegrationConfig):
-            pass
+    def test_secret_fields_follow_config_model_assigned_later(self, monkeypatch):
+        """Test that a ConfigModel assigned after class creation is filtered."""
 
-        class FakeModuleIntegration(BaseIntegration):
-            name = "fake"
-            display_name = "Fake"
-            ConfigModel = FakeIntegrationConfig
+        class PinConfig(IntegrationConfig):
+            pin: str = Field(..., json_schema_extra={"secret": True})
 
-            async def fetch_data(self):
-                return {}
+        monkeypatch.setattr(PydanticIntegration, "ConfigModel", PinConfig)
+
+        integration = PydanticIntegration({"pin": "1234"})
+
+        assert "pin" not in integration._get_safe_config()
+
+    def test_sensitive_keys_assigned_later_are_filtered(self, monkeypatch):
+        """Test that _sensitive_keys replaced after class creation is used."""
+        monkeypatch.setattr(PydanticIntegration, "_sensitive_keys", frozenset({"pin"}))
 
-        # Manually set the module name to something that doesn't exist
-        FakeModuleIntegration.__module__ = "nonexistent_module_xyz"
+        integration = PydanticIntegration({"pin": "1234"})
 
+        assert "pin" not in integration._get_safe_config()
+
+    def test_template_env_missing_module(self):
+        """Test error when integration module cannot be found."""
         integration = FakeModuleIntegration({})
 
         # Trying to get template env should raise RuntimeError
         with pytest.raises(RuntimeError, match="Cannot locate template directory"):
             integration._get_template_env()
 
-    def test_render_widget(self):
+    def test_render_widget(self, mock_integration_factory):
         """Test rendering a widget with data."""
         config = {"url": "https://example.com"}
-        integration = MockIntegration(config)
+        integration = mock_integration_factory(config)
 
         # This will fail because we don't have a widget.html template,
         # but we test that the method exists and works with data
@@ -187,19 +323,6 @@ class TestBaseIntegration:
 
     def test_get_config_value_from_pydantic_model(self):
         """Test get_config_value with Pydantic model."""
-
-        class MyConfig(IntegrationConfig):
-            api_key: str = "default-key"
-            timeout: int = 30
-
-        class PydanticIntegration(BaseIntegration):
-            name = "pydantic"
-            display_name = "Pydantic"
-            ConfigModel = MyConfig
-
-            async def fetch_data(self):
-                return {}
-
         integration = PydanticIntegration({"api_key": "custom-key", "timeout": 60})
 
         # Should get values from Pydantic model
@@ -207,20 +330,42 @@ class TestBaseIntegration:
         assert integration.get_config_value("timeout") == 60
         assert integration.get_config_value("nonexistent", "fallback") == "fallback"
 
+    def test_nested_config_models_are_plain_dicts(self):
+        """Test that nested models reach config and templates as dicts."""
+        integration = NestedIntegration(
+            {"url": "https://example.com", "inner": {"url": "https://inner.example"}}
+        )
+
+        expected = {"url": "https://inner.example", "timeout": 30}
+        assert integration.config["inner"] == expected
+        assert integration._get_safe_config()["inner"] == expected
+
+
+@pytest.fixture(scope="session")
+def discovered() -> Mapping[str, type[BaseIntegration]]:
+    """Scan the integrations directory once per test session."""
+    return discover_integrations()
+
 
 class TestIntegrationDiscovery:
     """Tests for integration discovery functions."""
 
-    def test_discover_integrations(self):
+    def test_discover_integrations(self, discovered):
         """Test that example integration is discovered."""
-        integrations = discover_integrations()
+        assert "example" in discovered
+        assert issubclass(discovered["example"], BaseIntegration)
+
+    def test_discover_integrations_cached(self):
+        """Test that discovery results are cached and read-only."""
+        discovered = discover_integrations()
 
-        assert "example" in integrations
-        assert issubclass(integrations["example"], BaseIntegration)
+        assert discover_integrations() is discovered
+        with pytest.raises(TypeError):
+            discovered["new"] = BaseIntegration  # type: ignore[index]
 
-    def test_load_integration(self):
+    def test_load_integration(self, discovered):
         """Test loading an integration by name."""
-        integration = load_integration("example", {"message": "Hello"})
+        integration = load_integration("example", {"message": "Hello"}, discovered)
 
         assert integration.name == "example"
         assert integration.display_name == "Example Widget"
@@ -241,90 +386,144 @@ class TestIntegrationDiscovery:
         assert "stats" in data
         assert len(data["stats"]) == 3
 
-    def test_discover_integrations_with_bad_import(self, tmp_path, monkeypatch):
+    def test_discover_integrations_with_bad_import(self, monkeypatch, caplog):
         """Test discovery gracefully handles import errors."""
+        real_import_module = importlib.import_module
 
-        from integrations import discover_integrations
-
-        # Create a bad integration directory
-        bad_integration_dir = tmp_path / "integrations" / "bad_integration"
-        bad_integration_dir.mkdir(parents=True)
+        def failing_import_module(name: str) -> ModuleType:
+            if name == "integrations.example.integration":
+                raise RuntimeError("Bad integration")
+            return real_import_module(name)
 
-        # Create integration.py that will fail to import
-        (bad_integration_dir / "integration.py").write_text(
-            "raise RuntimeError('Bad integration')"
+        monkeypatch.setattr(
+            integrations.importlib, "import_module", failing_import_module
         )
 
-        # Add temp directory to path
-        monkeypatch.syspath_prepend(str(tmp_path))
-
         # Test that discovery logs error but doesn't crash
-        integrations = discover_integrations()
-        # Should not contain the bad integration
-        assert "bad_integration" not in integrations
-
-    def test_discover_integrations_ignores_non_integration_classes(self):
+        discover_integrations.cache_clear()
+        try:
+            discovered = discover_integrations()
+        finally:
+            discover_integrations.cache_clear()
+        # Should not contain the bad integration, but keep the others
+        assert "example" not in discovered
+        assert "todoist" in discovered
+        assert "Failed to load integration 'example'" in caplog.text
+
+    def test_discover_integrations_ignores_non_integration_classes(self, discovered):
         """Test that discover_integrations only picks integration classes."""
-        from integrations import discover_integrations
-
-        # Verify that only BaseIntegration subclasses are discovered
-        integrations = discover_integrations()
-
-        # All discovered integrations should be classes
-        for _name, cls in integrations.items():
+        # All discovered integrations should be BaseIntegration subclasses
+        for _name, cls in discovered.items():
             assert isinstance(cls, type)
             assert issubclass(cls, BaseIntegration)
             assert hasattr(cls, "name")
             assert hasattr(cls, "display_name")
 
-    def test_load_integration_with_pre_discovered(self):
+    def test_load_integration_with_pre_discovered(self, discovered):
         """Test loading integration with pre-discovered integrations dict."""
-        from integrations import discover_integrations, load_integration
-
-        discovered = discover_integrations()
         integration = load_integration("example", {"message": "Test"}, discovered)
 
         assert integration.name == "example"
         assert integration.display_name == "Example Widget"
 
 
+@pytest.fixture(scope="module")
+def example_integration() -> ExampleIntegration:
+    """Shared ExampleIntegration for tests that only read fetched data."""
+    return ExampleIntegration({"message": "Test"})
+
+
 class TestExampleIntegration:
     """Tests for ExampleIntegration edge cases."""
 
     async def test_rolling_average_with_empty_deque(self):
         """Test rolling average calculation with empty history."""
-        from integrations.example import ExampleIntegration
-
         integration = ExampleIntegration({"message": "Test"})
 
         # With empty history, should return 0.0
         result = integration._get_rolling_average(integration._cpu_history)
         assert result == 0.0
 
-    async def test_fetch_data_multiple_times_accumulates_history(self):
-        """Test that cpu/memory history accumulates correctly over multiple fetches."""
-        from integrations.example import ExampleIntegration
+    def test_rolling_sum_evicts_oldest_sample(self):
+        """Test the running total drops samples that leave the window."""
+        history = RollingSum(maxlen=2)
+        for value in (1.0, 2.0, 3.0):
+            history.append(value)
 
-        integration = ExampleIntegration({"message": "Test"})
+        assert len(history) == 2
+        assert history.total == 5.0
 
-        # Fetch data multiple times
-        for _ in range(5):
-            data = await integration.fetch_data()
-            assert "stats" in data
-            assert len(data["stats"]) == 3
+    def test_system_sampler_throttles_psutil_calls(self, monkeypatch):
+        """Test readings are shared until min_interval has elapsed."""
+        calls = []
 
-        # History should have accumulated
-        assert len(integration._cpu_history) >= 3
-        assert len(integration._memory_history) >= 3
+        def mock_virtual_memory():
+            calls.append(1)
+            return SimpleNamespace(percent=42.0)
 
-    async def test_fetch_data_returns_averaged_stats(self):
-        """Test that stats are properly calculated from rolling averages."""
-        from integrations.example import ExampleIntegration
+        monkeypatch.setattr(psutil, "virtual_memory", mock_virtual_memory)
+        sampler = SystemSampler(min_interval=60)
+
+        sampler.sample()
+        sampler.sample()
+
+        assert len(calls) == 1
+        assert sampler.memory == 42.0
+
+    async def test_sampler_shared_and_created_on_first_fetch(self, monkeypatch):
+        """Test one sampler is created on first fetch and shared by instances."""
+        monkeypatch.setattr(psutil, "cpu_percent", lambda interval=None: 0.0)
+        example_module._get_sampler.cache_clear()
+        try:
+            first = ExampleIntegration({"message": "One"})
+            second = ExampleIntegration({"message": "Two"})
+            assert example_module._get_sampler.cache_info().currsize == 0
+
+            await first.fetch_data()
+            await second.fetch_data()
+
+            assert example_module._get_sampler.cache_info().misses == 1
+        finally:
+            example_module._get_sampler.cache_clear()
+
+    def test_system_sampler_first_reading_is_measured(self, monkeypatch):
+        """Test the first CPU reading blocks briefly instead of reporting ~0."""
+        intervals = []
+
+        def mock_cpu_percent(interval=None):
+            intervals.append(interval)
+            return 50.0
 
+        monkeypatch.setattr(psutil, "cpu_percent", mock_cpu_percent)
+        sampler = SystemSampler(min_interval=0)
+
+        sampler.sample()
+        sampler.sample()
+
+        assert intervals == [0.1, None]
+        assert sampler.cpu == 50.0
+
+    async def test_fetch_data_multiple_times_accumulates_history(self):
+        """Test that cpu/memory history accumulates correctly over multiple fetches."""
         integration = ExampleIntegration({"message": "Test"})
 
-        # Fetch data once to populate history
-        data1 = await integration.fetch_data()
+        # Seed history directly instead of sampling psutil repeatedly
+        for cpu, memory in ((10.0, 40.0), (20.0, 50.0), (30.0, 60.0)):
+            integration._cpu_history.append(cpu)
+            integration._memory_history.append(memory)
+
+        data = await integration.fetch_data()
+
+        # The fetch adds one sample and averages over the whole window
+        assert len(integration._cpu_history) == 4
+        assert len(integration._memory_history) == 4
+        cpu_stat, memory_stat, _temp_stat = data["stats"]
+        assert cpu_stat["value"] == round(integration._cpu_history.total / 4, 1)
+        assert memory_stat["value"] == round(integration._memory_history.total / 4, 1)
+
+    async def test_fetch_data_returns_averaged_stats(self, example_integration):
+        """Test that stats are properly calculated from rolling averages."""
+        data1 = await example_integration.fetch_data()
 
         # Check that stats are numbers
         for stat in data1["stats"]:
@@ -332,17 +531,14 @@ class TestExampleIntegration:
             assert isinstance(stat["label"], str)
             assert isinstance(stat["unit"], str)
 
-    async def test_fetch_data_has_required_fields(self):
+    async def test_fetch_data_has_required_fields(self, example_integration):
         """Test that fetch_data returns all required fields."""
-        from integrations.example import ExampleIntegration
-
-        integration = ExampleIntegration({"message": "Custom Message"})
-        data = await integration.fetch_data()
+        data = await example_integration.fetch_data()
 
         assert "current_time" in data
         assert "current_date" in data
         assert "message" in data
-        assert data["message"] == "Custom Message"
+        assert data["message"] == "Test"
         assert "stats" in data
         assert len(data["stats"]) == 3
 
@@ -466,10 +662,10 @@ class TestBaseIntegrationErrorHandling:
         # URL is safe
         assert safe_config["url"] == "https://api.example.com"
 
-    def test_template_env_cached(self):
+    def test_template_env_cached(self, mock_integration_factory):
         """Test that _get_template_env caches the environment."""
         config = {"url": "https://example.com"}
-        integration = MockIntegration(config)
+        integration = mock_integration_factory(config)
 
         # First call creates the environment
         env1 = integration._get_template_env()
@@ -479,6 +675,31 @@ class TestBaseIntegrationErrorHandling:
         # Should be the same object (cached)
         assert env1 is env2
 
+        # Other instances of the same class share the environment
+        other = mock_integration_factory({"url": "https://other.example.com"})
+        assert other._get_template_env() is env1
+
+    def test_bytecode_cache_falls_back_when_unavailable(self, monkeypatch):
+        """Test that an unusable temp dir disables the bytecode cache."""
+
+        def unwritable_cache():
+            raise RuntimeError("Cannot determine safe temp directory")
+
+        monkeypatch.setattr(base_module, "FileSystemBytecodeCache", unwritable_cache)
+        base_module._get_bytecode_cache.cache_clear()
+        try:
+            assert base_module._get_bytecode_cache() is None
+        finally:
+            base_module._get_bytecode_cache.cache_clear()
+
+    def test_widget_template_compiled_once(self):
+        """Test that widget.html is compiled once and reused across renders."""
+        integration = ExampleIntegration({"message": "Test"})
+        env = integration._get_template_env()
+
+        assert env.auto_reload is False
+        assert env.get_template("widget.html") is env.get_template("widget.html")
+
     def test_get_safe_config_with_no_pydantic_model(self):
         """Test _get_safe_config when ConfigModel is None."""
 
@@ -1,5 +1,7 @@
 """Tests for the theming system."""
 
+import re
+
 import pytest
 
 from server.themes import (
@@ -12,6 +14,21 @@ from server.themes import (
     list_themes,
 )
 
+# THEMES is static, so reference key sets are computed once at import
+_INDUSTRIAL_KEYS = frozenset(INDUSTRIAL_THEME["colors"])
+_THEMES_TO_CHECK = [
+    (name, frozenset(theme["colors"]))
+    for name, theme in THEMES.items()
+    if name != "dark"  # Skip alias
+]
+_HEX_RE = re.compile(r"#[0-9a-fA-F]{6}")
+_HEX_CASES = [
+    (name, key, value)
+    for name, theme in THEMES.items()
+    if name != "dark"  # Skip alias
+    for key, value in theme["colors"].items()
+]
+
 
 def test_industrial_theme_structure():
     """Test industrial theme has required structure."""
@@ -90,34 +107,19 @@ def test_themes_dict():
     assert "dark" in THEMES  # Legacy alias
 
 
-def test_get_theme_industrial():
-    """Test getting industrial theme."""
-    theme = get_theme("industrial")
-    assert theme == INDUSTRIAL_THEME
-
-
-def test_get_theme_pink():
-    """Test getting pink theme."""
-    theme = get_theme("pink")
-    assert theme == PINK_THEME
-
-
-def test_get_theme_neon():
-    """Test getting neon theme."""
-    theme = get_theme("neon")
-    assert theme == NEON_THEME
-
-
-def test_get_theme_matrix():
-    """Test getting matrix theme."""
-    theme = get_theme("matrix")
-    assert theme == MATRIX_THEME
-
-
-def test_get_theme_dark_alias():
-    """Test that 'dark' is an alias for 'industrial'."""
-    theme = get_theme("dark")
-    assert theme == INDUSTRIAL_THEME
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("industrial", INDUSTRIAL_THEME),
+        ("pink", PINK_THEME),
+        ("neon", NEON_THEME),
+        ("matrix", MATRIX_THEME),
+        ("dark", INDUSTRIAL_THEME),  # 'dark' is an alias for 'industrial'
+    ],
+)
+def test_get_theme(name, expected):
+    """Test getting each theme by name."""
+    assert get_theme(name) == expected
 
 
 def test_get_theme_unknown():
@@ -141,30 +143,17 @@ def test_list_themes():
 
 def test_all_themes_have_same_color_keys():
     """Test all themes define the same color keys."""
-    industrial_keys = set(INDUSTRIAL_THEME["colors"].keys())
-
-    for theme_name, theme in THEMES.items():
-        if theme_name == "dark":
-            continue  # Skip alias
-        theme_keys = set(theme["colors"].keys())
-        assert theme_keys == industrial_keys, (
+    for theme_name, theme_keys in _THEMES_TO_CHECK:
+        assert theme_keys == _INDUSTRIAL_KEYS, (
             f"Theme {theme_name} has different keys: "
-            f"missing={industrial_keys - theme_keys}, "
-            f"extra={theme_keys - industrial_keys}"
+            f"missing={_INDUSTRIAL_KEYS - theme_keys}, "
+            f"extra={theme_keys - _INDUSTRIAL_KEYS}"
         )
 
 
-def test_all_colors_are_hex():
-    """Test all color values are valid hex colors."""
-    for theme_name, theme in THEMES.items():
-        if theme_name == "dark":
-            continue  # Skip alias
-        for color_key, color_value in theme["colors"].items():
-            assert color_value.startswith(
-                "#"
-            ), f"Theme {theme_name}, color {color_key} is not hex: {color_value}"
-            assert (
-                len(color_value) == 7
-            ), f"Theme {theme_name}, color {color_key} has invalid length: {color_value}"
-            # Check it's valid hex
-            int(color_value[1:], 16)  # Will raise ValueError if invalid
+@pytest.mark.parametrize("theme_name,color_key,color_value", _HEX_CASES)
+def test_all_colors_are_hex(theme_name, color_key, color_value):
+    """Test all color values are valid 6-digit hex colors."""
+    assert _HEX_RE.fullmatch(
+        color_value
+    ), f"Theme {theme_name}, color {color_key} is not hex: {color_value}"
@@ -1,36 +1,57 @@
 """Tests for Todoist integration."""
 
-from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock
-
+import asyncio
+import logging
+import re
+from collections.abc import Generator
+from datetime import date, datetime, timedelta
+from functools import cache
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import orjson
 import pytest
+from freezegun import freeze_time
 
 from integrations import load_integration
 from integrations.todoist.integration import TodoistConfig, TodoistIntegration
+from server import main as server_main
 
 
 class TestTodoistConfig:
     """Tests for TodoistConfig model."""
 
-    def test_todoist_config_with_required_fields(self):
-        """Test TodoistConfig with all required fields."""
-        config = TodoistConfig(api_token="test-token-123")
-
-        assert config.api_token == "test-token-123"
-        assert config.max_tasks == 10  # Default value
-        assert config.refresh_rate == 60  # Default value
-
-    def test_todoist_config_with_custom_values(self):
-        """Test TodoistConfig with custom values."""
-        config = TodoistConfig(
-            api_token="custom-token",
-            max_tasks=20,
-            refresh_rate=120,
-        )
-
-        assert config.api_token == "custom-token"
-        assert config.max_tasks == 20
-        assert config.refresh_rate == 120
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            # Required fields only; the rest fall back to defaults
+            (
+                {"api_token": "test-token-123"},
+                {
+                    "api_token": "test-token-123",
+                    "max_tasks": 10,
+                    "refresh_rate": 60,
+                    "work_parent_project": "",
+                },
+            ),
+            (
+                {"api_token": "custom-token", "max_tasks": 20, "refresh_rate": 120},
+                {"api_token": "custom-token", "max_tasks": 20, "refresh_rate": 120},
+            ),
+            (
+                {"api_token": "test-token", "work_parent_project": "Work"},
+                {"work_parent_project": "Work"},
+            ),
+        ],
+        ids=["defaults", "custom_values", "work_parent_project"],
+    )
+    def test_todoist_config_values(self, kwargs, expected):
+        """Test TodoistConfig with required fields and with custom values."""
+        config = TodoistConfig(**kwargs)
+
+        assert config.model_dump(include=set(expected)) == expected
 
     def test_todoist_config_api_token_marked_as_secret(self):
         """Test that api_token is marked as secret in json_schema_extra."""
@@ -40,21 +61,6 @@ class TestTodoistConfig:
 
         assert json_schema_extra.get("secret") is True
 
-    def test_todoist_config_with_work_parent_project(self):
-        """Test TodoistConfig with work_parent_project configuration."""
-        config = TodoistConfig(
-            api_token="test-token",
-            work_parent_project="Work",
-        )
-
-        assert config.work_parent_project == "Work"
-
-    def test_todoist_config_work_parent_project_default(self):
-        """Test TodoistConfig work_parent_project defaults to empty string."""
-        config = TodoistConfig(api_token="test-token")
-
-        assert config.work_parent_project == ""
-
 
 def create_mock_task(
     task_id: str,
@@ -63,50 +69,148 @@ def create_mock_task(
     priority: int = 1,
     project_id: str = "project1",
     duration: dict | None = None,
-):
+) -> SimpleNamespace:
     """Helper to create a mock Todoist task."""
-    task = MagicMock()
-    task.id = task_id
-    task.content = content
-    task.description = ""
-    task.priority = priority
-    task.labels = []
-    task.project_id = project_id
-    task.duration = duration
-
+    due = None
     if due_date:
-        from datetime import datetime
+        due = SimpleNamespace(
+            # Parse the string to a date object to match real API behavior
+            date=date.fromisoformat(due_date),
+            datetime=None,
+            string=due_date,
+            is_recurring=False,
+            timezone=None,
+        )
+
+    return SimpleNamespace(
+        id=task_id,
+        content=content,
+        description="",
+        priority=priority,
+        labels=[],
+        project_id=project_id,
+        duration=duration,
+        due=due,
+    )
+
+
+@cache
+def create_mock_project(
+    project_id: str, name: str, parent_id: str | None = None
+) -> SimpleNamespace:
+    """Helper to create a mock Todoist project (memoized; tests never mutate it)."""
+    return SimpleNamespace(id=project_id, name=name, parent_id=parent_id)
+
+
+# Every test in this module runs with the clock frozen on this date
+TODAY = date(2025, 6, 15)
+TODAY_STR = TODAY.isoformat()
+YESTERDAY_STR = (TODAY - timedelta(days=1)).isoformat()
+TOMORROW_STR = (TODAY + timedelta(days=1)).isoformat()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _freeze_today() -> Generator[None, None, None]:
+    """Freeze the clock so tests and the integration agree on "today"."""
+    # real_asyncio keeps the event loop on the real monotonic clock, and
+    # ignoring _pytest keeps --durations and timeouts on real time
+    with freeze_time(TODAY, real_asyncio=True, ignore=["_pytest"]):
+        yield
+
+
+@pytest.fixture
+def integration(request: pytest.FixtureRequest) -> TodoistIntegration:
+    """Fresh integration for each test.
+
+    Config overrides come from indirect parametrization, e.g.
+    ``@pytest.mark.parametrize("integration", [{"max_tasks": 5}], indirect=True)``.
+    """
+    overrides = getattr(request, "param", {})
+    return TodoistIntegration({"api_token": "test-token-123", **overrides})
+
+
+@pytest.fixture
+def mock_httpx_client(integration: TodoistIntegration) -> AsyncMock:
+    """Mock HTTP client injected as the integration's shared client."""
+    client = AsyncMock()
+    integration._client = client
+    return client
+
+
+# Shared by the stream tests' HTTPStatusErrors; the integration only reads
+# response.status_code
+SYNC_REQUEST = SimpleNamespace()
+RESPONSE_401 = SimpleNamespace(status_code=401)
+RESPONSE_500 = SimpleNamespace(status_code=500)
+
 
-        task.due = MagicMock()
-        # Parse the string to a date object to match real API behavior
-        task.due.date = datetime.fromisoformat(due_date).date()
-        task.due.datetime = None
-        task.due.string = due_date
-        task.due.is_recurring = False
-        task.due.timezone = None
-    else:
-        task.due = None
+def raise_connect_timeout(request: httpx.Request) -> httpx.Response:
+    """MockTransport handler for a Sync request that never connects."""
+    raise httpx.ConnectTimeout("Connection timed out", request=request)
 
-    return task
 
+class WaitRecorder:
+    """Stand-in for _wait_for_stop that records delays instead of waiting.
 
-def create_mock_project(project_id: str, name: str, parent_id: str | None = None):
-    """Helper to create a mock Todoist project."""
-    project = MagicMock()
-    project.id = project_id
-    project.name = name
-    project.parent_id = parent_id
-    return project
+    With stop_after set, the call that reaches that count and every later
+    one report a stop request, which ends a polling loop.
+    """
+
+    def __init__(self, stop_after: int | None = None) -> None:
+        self.calls: list[float] = []
+        self.stop_after = stop_after
+
+    async def __call__(self, seconds: float) -> bool:
+        self.calls.append(seconds)
+        return self.stop_after is not None and len(self.calls) >= self.stop_after
+
+
+def make_response(payload: Any) -> SimpleNamespace:
+    """Minimal successful httpx response whose body is payload as JSON."""
+    return SimpleNamespace(content=orjson.dumps(payload), raise_for_status=lambda: None)
+
+
+def make_completed_page(items: list[dict[str, Any]]) -> SimpleNamespace:
+    """Last (only) page of a completed-tasks response holding items."""
+    return make_response({"items": items, "next_cursor": None})
+
+
+class StubTodoistApi:
+    """Minimal async stand-in for TodoistAPIAsync.
+
+    tasks/projects are returned as-is, so tests can hand back a list or an
+    async generator like the real client.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: Any = []
+        self.projects: Any = []
+        self.raise_on_tasks: Exception | None = None
+        self.get_tasks_calls = 0
+
+    async def get_tasks(self) -> Any:
+        self.get_tasks_calls += 1
+        if self.raise_on_tasks:
+            raise self.raise_on_tasks
+        return self.tasks
+
+    async def get_projects(self) -> Any:
+        return self.projects
+
+
+@pytest.fixture
+def stub_api(integration: TodoistIntegration) -> StubTodoistApi:
+    """Stub API client wired into integration; returns no tasks or projects."""
+    stub = StubTodoistApi()
+    integration._get_api = lambda: stub
+    return stub
 
 
 class TestTodoistIntegration:
     """Tests for TodoistIntegration class."""
 
-    def test_init_with_valid_config(self):
+    def test_init_with_valid_config(self, integration):
         """Test initialization with valid configuration."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
         assert integration.name == "todoist"
         assert integration.display_name == "Todoist"
         assert integration.refresh_interval == 60
@@ -114,11 +218,9 @@ class TestTodoistIntegration:
         assert integration.get_config_value("max_tasks") == 10
         assert integration._api is None
 
-    def test_init_with_custom_max_tasks(self):
+    @pytest.mark.parametrize("integration", [{"max_tasks": 25}], indirect=True)
+    def test_init_with_custom_max_tasks(self, integration):
         """Test initialization with custom max_tasks."""
-        config = {"api_token": "test-token-123", "max_tasks": 25}
-        integration = TodoistIntegration(config)
-
         assert integration.get_config_value("max_tasks") == 25
 
     def test_init_missing_required_api_token(self):
@@ -128,23 +230,13 @@ class TestTodoistIntegration:
         with pytest.raises(ValueError, match="config validation failed"):
             TodoistIntegration(config)
 
-    async def test_fetch_data_returns_valid_structure(self, monkeypatch):
+    async def test_fetch_data_returns_valid_structure(self, integration, stub_api):
         """Test fetch_data returns expected data structure."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        today_str = datetime.now().date().isoformat()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Task 1", today_str),
+        stub_api.tasks = [
+            create_mock_task("1", "Task 1", TODAY_STR),
             create_mock_task("2", "Task 2", "2025-01-01"),  # Overdue
         ]
-        mock_api.get_projects.return_value = [
-            create_mock_project("project1", "Project 1")
-        ]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.projects = [create_mock_project("project1", "Project 1")]
 
         data = await integration.fetch_data()
 
@@ -168,41 +260,23 @@ class TestTodoistIntegration:
         assert isinstance(data["max_tasks"], int)
         assert isinstance(data["timestamp"], str)
 
-    async def test_fetch_data_respects_max_tasks_config(self, monkeypatch):
-        """Test that fetch_data respects max_tasks configuration."""
-        config = {"api_token": "test-token-123", "max_tasks": 5}
-        integration = TodoistIntegration(config)
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = []
-        mock_api.get_projects.return_value = []
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
-        data = await integration.fetch_data()
-
-        assert data["max_tasks"] == 5
-
-    async def test_fetch_data_with_default_max_tasks(self, monkeypatch):
-        """Test fetch_data with default max_tasks value."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = []
-        mock_api.get_projects.return_value = []
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
+    @pytest.mark.parametrize(
+        "integration,expected",
+        [
+            ({"max_tasks": 5}, 5),
+            ({}, 10),  # Default value
+        ],
+        indirect=["integration"],
+    )
+    async def test_fetch_data_max_tasks(self, integration, stub_api, expected):
+        """Test that fetch_data reports configured or default max_tasks."""
         data = await integration.fetch_data()
 
-        assert data["max_tasks"] == 10  # Default value
+        assert data["max_tasks"] == expected
 
-    def test_api_token_filtered_from_safe_config(self):
+    @pytest.mark.parametrize("integration", [{"max_tasks": 15}], indirect=True)
+    def test_api_token_filtered_from_safe_config(self, integration):
         """Test that api_token is filtered from safe config."""
-        config = {"api_token": "secret-token-123", "max_tasks": 15}
-        integration = TodoistIntegration(config)
-
         safe_config = integration._get_safe_config()
 
         # api_token should be filtered (marked as secret in Pydantic model)
@@ -218,19 +292,29 @@ class TestTodoistIntegration:
         assert integration.name == "todoist"
         assert integration.display_name == "Todoist"
 
-    async def test_fetch_data_error_handling(self, monkeypatch):
-        """Test fetch_data handles errors gracefully."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
+    @pytest.mark.parametrize(
+        "error",
+        [Exception("API error"), RuntimeError("Simulated error")],
+    )
+    async def test_fetch_data_logs_and_reraises_errors(
+        self, integration, stub_api, caplog, error
+    ):
+        """Test that fetch_data logs and re-raises API errors."""
         # Mock the API client to raise an error
-        mock_api = AsyncMock()
-        mock_api.get_tasks.side_effect = Exception("API error")
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.raise_on_tasks = error
 
-        # Should re-raise the exception
-        with pytest.raises(Exception, match="API error"):
-            await integration.fetch_data()
+        # fetch_data should log the error and re-raise
+        with caplog.at_level(logging.ERROR, logger="integrations.todoist.integration"):
+            with pytest.raises(type(error), match=str(error)):
+                await integration.fetch_data()
+
+        # Verify error was logged once
+        messages = [
+            r.getMessage()
+            for r in caplog.records
+            if r.name == "integrations.todoist.integration"
+        ]
+        assert messages == [f"Error fetching Todoist data: {error}"]
 
     def test_integration_class_attributes(self):
         """Test TodoistIntegration class has correct attributes."""
@@ -252,17 +336,8 @@ class TestTodoistIntegration:
         assert integration.get_config_value("api_token") == "test-token-123"
         assert integration.get_config_value("max_tasks") == 15
 
-    async def test_multiple_fetch_calls(self, monkeypatch):
+    async def test_multiple_fetch_calls(self, integration, stub_api):
         """Test that fetch_data can be called multiple times."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = []
-        mock_api.get_projects.return_value = []
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
         data1 = await integration.fetch_data()
         data2 = await integration.fetch_data()
 
@@ -272,75 +347,172 @@ class TestTodoistIntegration:
         assert "today_tasks" in data1
         assert "today_tasks" in data2
         # API should have been called twice
-        assert mock_api.get_tasks.call_count == 2
+        assert stub_api.get_tasks_calls == 2
 
-    async def test_fetch_data_exception_logging(self, monkeypatch):
-        """Test that fetch_data logs and re-raises exceptions."""
-        from integrations.todoist.integration import TodoistIntegration
+    def test_get_api_creates_client(self, integration):
+        """Test that _get_api creates a Todoist API client."""
+        assert integration._api is None
+        api = integration._get_api()
+        assert api is not None
+        assert integration._api is api
 
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
+        # Subsequent calls return the same instance
+        api2 = integration._get_api()
+        assert api2 is api
 
-        # Capture log messages
-        log_messages = []
+    async def test_get_client_is_shared_until_closed(
+        self, integration, mock_httpx_client
+    ):
+        """Test that _get_client reuses one HTTP client until close()."""
+        client = integration._get_client()
+        assert client is mock_httpx_client
+        assert integration._get_client() is client
 
-        def mock_error(msg):
-            log_messages.append(msg)
+        await integration.close()
 
-        # Patch logger.error to capture messages
-        monkeypatch.setattr("integrations.todoist.integration.logger.error", mock_error)
+        mock_httpx_client.aclose.assert_awaited_once()
+        assert integration._client is None
 
-        # Mock API to raise an error
-        mock_api = AsyncMock()
-        mock_api.get_tasks.side_effect = RuntimeError("Simulated error")
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+    async def test_stop_wakes_waiting_event_stream(
+        self, integration, mock_httpx_client
+    ):
+        """Test that stop() ends an event stream mid poll wait."""
 
-        # fetch_data should log the error and re-raise
-        with pytest.raises(RuntimeError, match="Simulated error"):
-            await integration.fetch_data()
+        async def mock_check_for_changes(client):
+            return True, "token1"
 
-        # Verify error was logged
-        assert len(log_messages) == 1
-        assert "Error fetching Todoist data" in log_messages[0]
-        assert "Simulated error" in log_messages[0]
+        async def mock_fetch_data():
+            return {}
 
-    def test_get_api_creates_client(self):
-        """Test that _get_api creates a Todoist API client."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
+        integration._check_for_changes = mock_check_for_changes
+        integration.fetch_data = mock_fetch_data
 
-        assert integration._api is None
-        api = integration._get_api()
-        assert api is not None
-        assert integration._api is api
+        stream = integration.start_event_stream()
+        assert await anext(stream) == {}
+        # The default 5s poll wait would outlast the deadline below
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        integration.stop()
 
-        # Subsequent calls return the same instance
-        api2 = integration._get_api()
-        assert api2 is api
+        with pytest.raises(StopAsyncIteration):
+            async with asyncio.timeout(1):
+                await pending
 
-    async def test_fetch_data_categorizes_tasks_correctly(self, monkeypatch):
-        """Test that tasks are categorized into today, overdue, and upcoming."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
+    async def test_server_shutdown_stops_event_stream(
+        self, integration, mock_httpx_client, monkeypatch
+    ):
+        """Test server shutdown ends the stream via stop(), not cancellation."""
+
+        async def mock_check_for_changes(client):
+            return True, "token1"
+
+        async def mock_fetch_data():
+            return {}
+
+        integration._check_for_changes = mock_check_for_changes
+        integration.fetch_data = mock_fetch_data
+        integration.render_widget = lambda data: ""
+        monkeypatch.setattr(server_main, "preload_settings", AsyncMock())
+        monkeypatch.setattr(
+            server_main, "load_all_integrations", lambda: {"todoist": integration}
+        )
+
+        async with server_main.lifespan(server_main.app):
+            (task,) = server_main.background_tasks
+            # Let the initial sync finish so the stream sits in its poll wait
+            await asyncio.sleep(0.01)
+
+        assert task.done()
+        assert not task.cancelled()
+        mock_httpx_client.aclose.assert_awaited_once()
+
+    async def test_wait_for_stop_times_out_or_stops(self, integration):
+        """Test the real poll wait returns False on timeout and True once stopped."""
+        assert await integration._wait_for_stop(0.001) is False
+
+        integration.stop()
+
+        async with asyncio.timeout(1):
+            assert await integration._wait_for_stop(5) is True
+
+    async def test_get_client_bounds_concurrent_requests(
+        self, integration, monkeypatch
+    ):
+        """Test that the shared client never has more than 4 requests in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def serve_sync(reader, writer):
+            # Minimal HTTP/1.1 server that holds each request open briefly
+            nonlocal in_flight, peak
+            try:
+                while True:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    length = re.search(rb"content-length: *(\d+)", head, re.IGNORECASE)
+                    await reader.readexactly(int(length.group(1)) if length else 0)
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                    await asyncio.sleep(0.01)
+                    in_flight -= 1
+                    body = b'{"sync_token": "token1"}'
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                        b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+                    )
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        # MockTransport bypasses the connection pool, so serve real sockets
+        server = await asyncio.start_server(serve_sync, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(
+            "integrations.todoist.integration.SYNC_API_URL",
+            f"http://127.0.0.1:{port}/sync",
+        )
 
-        today = datetime.now().date()
-        yesterday = (today - timedelta(days=1)).isoformat()
-        today_str = today.isoformat()
-        tomorrow = (today + timedelta(days=1)).isoformat()
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Overdue task", yesterday, priority=4),
-            create_mock_task("2", "Today task", today_str, priority=3),
-            create_mock_task("3", "Upcoming task", tomorrow, priority=1),
+        try:
+            client = integration._get_client()
+            results = await asyncio.gather(
+                *(integration._check_for_changes(client) for _ in range(20))
+            )
+        finally:
+            await integration.close()
+            server.close()
+            await server.wait_closed()
+
+        assert results == [(False, "token1")] * 20
+        assert 0 < peak <= 4
+
+    async def test_completed_fetches_reuse_client(self, integration, monkeypatch):
+        """Test that repeated completed-task fetches share one HTTP client."""
+        created = []
+
+        def client_factory(*args, **kwargs):
+            client = AsyncMock()
+            client.get.return_value = make_completed_page([])
+            created.append(client)
+            return client
+
+        monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+
+        await integration._fetch_completed_with_billing({})
+        await integration._fetch_completed_with_billing({})
+
+        assert len(created) == 1
+        assert created[0].get.await_count == 2
+
+    async def test_fetch_data_categorizes_tasks_correctly(self, integration, stub_api):
+        """Test that tasks are categorized into today, overdue, and upcoming."""
+        stub_api.tasks = [
+            create_mock_task("1", "Overdue task", YESTERDAY_STR, priority=4),
+            create_mock_task("2", "Today task", TODAY_STR, priority=3),
+            create_mock_task("3", "Upcoming task", TOMORROW_STR, priority=1),
             create_mock_task("4", "No due date", None),
         ]
-        mock_api.get_projects.return_value = [
-            create_mock_project("project1", "Project 1")
-        ]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.projects = [create_mock_project("project1", "Project 1")]
 
         data = await integration.fetch_data()
 
@@ -355,82 +527,48 @@ class TestTodoistIntegration:
         assert data["total_tasks"] == 4
         assert data["projects_count"] == 1
 
-    async def test_fetch_data_sorts_by_priority(self, monkeypatch):
+    async def test_fetch_data_sorts_by_priority(self, integration, stub_api):
         """Test that tasks are sorted by priority (highest first)."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
-
-        # Mock the API client with multiple today tasks
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Low priority", today_str, priority=1),
-            create_mock_task("2", "High priority", today_str, priority=4),
-            create_mock_task("3", "Medium priority", today_str, priority=2),
+        stub_api.tasks = [
+            create_mock_task("1", "Low priority", TODAY_STR, priority=1),
+            create_mock_task("2", "High priority", TODAY_STR, priority=4),
+            create_mock_task("3", "Medium priority", TODAY_STR, priority=2),
         ]
-        mock_api.get_projects.return_value = []
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
 
         data = await integration.fetch_data()
 
         # Verify tasks are sorted by priority (highest first)
-        assert len(data["today_tasks"]) == 3
-        assert data["today_tasks"][0]["priority"] == 4
-        assert data["today_tasks"][1]["priority"] == 2
-        assert data["today_tasks"][2]["priority"] == 1
+        assert [t["priority"] for t in data["today_tasks"]] == [4, 2, 1]
 
-    async def test_fetch_data_includes_project_names(self, monkeypatch):
+    async def test_fetch_data_includes_project_names(self, integration, stub_api):
         """Test that tasks include project names from project map."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Task 1", today_str, project_id="proj1"),
-            create_mock_task("2", "Task 2", today_str, project_id="proj2"),
+        stub_api.tasks = [
+            create_mock_task("1", "Task 1", TODAY_STR, project_id="proj1"),
+            create_mock_task("2", "Task 2", TODAY_STR, project_id="proj2"),
         ]
-        mock_api.get_projects.return_value = [
+        stub_api.projects = [
             create_mock_project("proj1", "Work"),
             create_mock_project("proj2", "Personal"),
         ]
 
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
         data = await integration.fetch_data()
 
         # Verify project names are included
-        assert data["today_tasks"][0]["project_name"] == "Work"
-        assert data["today_tasks"][1]["project_name"] == "Personal"
+        assert [t["project_name"] for t in data["today_tasks"]] == ["Work", "Personal"]
 
-    async def test_fetch_data_with_due_but_no_date(self, monkeypatch):
+    async def test_fetch_data_with_due_but_no_date(self, integration, stub_api):
         """Test task with due object but no date (edge case)."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
         # Create a task with due but no date
-        task = MagicMock()
-        task.id = "1"
-        task.content = "Task with due but no date"
-        task.description = ""
-        task.priority = 1
-        task.labels = []
-        task.project_id = "proj1"
-        task.due = MagicMock()
-        task.due.date = None  # Has due object but no date
-        task.due.datetime = None
-        task.due.string = "someday"
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [task]
-        mock_api.get_projects.return_value = [create_mock_project("proj1", "Inbox")]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        task = create_mock_task("1", "Task with due but no date", project_id="proj1")
+        task.due = SimpleNamespace(
+            date=None,  # Has due object but no date
+            datetime=None,
+            string="someday",
+            is_recurring=False,
+            timezone=None,
+        )
+        stub_api.tasks = [task]
+        stub_api.projects = [create_mock_project("proj1", "Inbox")]
 
         data = await integration.fetch_data()
 
@@ -439,35 +577,20 @@ class TestTodoistIntegration:
         assert len(data["overdue_tasks"]) == 0
         assert data["upcoming_count"] == 1
 
-    async def test_fetch_data_with_datetime_due_date(self, monkeypatch):
+    async def test_fetch_data_with_datetime_due_date(self, integration, stub_api):
         """Test task with datetime object as due date (instead of date object)."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
-
         # Create a task with datetime as due date
-        task = MagicMock()
-        task.id = "1"
-        task.content = "Task with datetime due"
-        task.description = ""
-        task.priority = 1
-        task.labels = []
-        task.project_id = "proj1"
-        task.due = MagicMock()
-        # Use datetime object instead of date object
-        task.due.date = datetime.now()  # datetime, not date
-        task.due.datetime = datetime.now()
-        task.due.string = today_str
-        task.due.is_recurring = False
-        task.due.timezone = None
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [task]
-        mock_api.get_projects.return_value = [create_mock_project("proj1", "Inbox")]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        task = create_mock_task("1", "Task with datetime due", project_id="proj1")
+        task.due = SimpleNamespace(
+            # Use datetime object instead of date object
+            date=datetime.now(),  # datetime, not date
+            datetime=datetime.now(),
+            string=TODAY_STR,
+            is_recurring=False,
+            timezone=None,
+        )
+        stub_api.tasks = [task]
+        stub_api.projects = [create_mock_project("proj1", "Inbox")]
 
         data = await integration.fetch_data()
 
@@ -475,26 +598,19 @@ class TestTodoistIntegration:
         assert len(data["today_tasks"]) == 1
         assert data["today_tasks"][0]["content"] == "Task with datetime due"
 
-    async def test_fetch_data_with_async_generators(self, monkeypatch):
+    async def test_fetch_data_with_async_generators(self, integration, stub_api):
         """Test fetch_data handles async generators from real API."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
 
         # Create async generator functions to simulate real API behavior
         async def tasks_async_gen():
-            yield [create_mock_task("1", "Task 1", today_str)]
+            yield [create_mock_task("1", "Task 1", TODAY_STR)]
 
         async def projects_async_gen():
             yield [create_mock_project("proj1", "Project 1")]
 
         # Mock the API client with async generators
-        mock_api = AsyncMock()
-        mock_api.get_tasks = AsyncMock(return_value=tasks_async_gen())
-        mock_api.get_projects = AsyncMock(return_value=projects_async_gen())
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.tasks = tasks_async_gen()
+        stub_api.projects = projects_async_gen()
 
         data = await integration.fetch_data()
 
@@ -503,181 +619,139 @@ class TestTodoistIntegration:
         assert data["today_tasks"][0]["content"] == "Task 1"
         assert data["projects_count"] == 1
 
-    def test_poll_interval_config(self):
+    @pytest.mark.parametrize("integration", [{"poll_interval": 10}], indirect=True)
+    def test_poll_interval_config(self, integration):
         """Test poll_interval configuration option."""
-        config = {"api_token": "test-token", "poll_interval": 10}
-        integration = TodoistIntegration(config)
-
         assert integration.get_config_value("poll_interval") == 10
 
-    def test_poll_interval_default(self):
+    def test_poll_interval_default(self, integration):
         """Test poll_interval defaults to 5 seconds."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
         assert integration.get_config_value("poll_interval") == 5
 
 
+# A short deadline lets the hung-sync tests time out quickly
+@pytest.mark.parametrize(
+    "integration", [{"poll_interval": 1, "timeout_seconds": 0.05}], indirect=True
+)
 class TestTodoistEventStream:
     """Tests for Todoist event stream (Sync API) functionality."""
 
-    async def test_check_for_changes_full_sync(self, monkeypatch):
-        """Test _check_for_changes on initial full sync."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        # Mock httpx response for full sync
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "sync_token": "new-token-123",
-            "full_sync": True,
-            "items": [{"id": "1", "content": "Task 1"}],
-            "projects": [],
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.post = AsyncMock(return_value=mock_response)
-
-        has_changes, new_token = await integration._check_for_changes(mock_client)
-
-        assert has_changes is True
-        assert new_token == "new-token-123"
-        mock_client.post.assert_called_once()
-
-    async def test_check_for_changes_incremental_with_items(self, monkeypatch):
-        """Test _check_for_changes detects item changes in incremental sync."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-        integration._sync_token = "existing-token"
-
-        # Mock httpx response with item changes
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "sync_token": "new-token-456",
-            "full_sync": False,
-            "items": [{"id": "2", "content": "New task"}],
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.post = AsyncMock(return_value=mock_response)
-
-        has_changes, new_token = await integration._check_for_changes(mock_client)
-
-        assert has_changes is True
-        assert new_token == "new-token-456"
-
-    async def test_check_for_changes_incremental_with_projects(self, monkeypatch):
-        """Test _check_for_changes detects project changes."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-        integration._sync_token = "existing-token"
-
-        # Mock httpx response with project changes
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "sync_token": "new-token-789",
-            "full_sync": False,
-            "projects": [{"id": "p1", "name": "New project"}],
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.post = AsyncMock(return_value=mock_response)
-
-        has_changes, new_token = await integration._check_for_changes(mock_client)
-
-        assert has_changes is True
-        assert new_token == "new-token-789"
+    @pytest.fixture(autouse=True)
+    def mock_wait(self, monkeypatch) -> WaitRecorder:
+        """Stub the integration's poll waits so polling loops never wait."""
+        wait = WaitRecorder()
+        monkeypatch.setattr(TodoistIntegration, "_wait_for_stop", wait)
+        return wait
+
+    @pytest.mark.parametrize(
+        "initial_token,response_json,expected_changes,expected_token",
+        [
+            # Initial full sync
+            (
+                "*",
+                {
+                    "sync_token": "new-token-123",
+                    "full_sync": True,
+                    "items": [{"id": "1", "content": "Task 1"}],
+                    "projects": [],
+                },
+                True,
+                "new-token-123",
+            ),
+            # Incremental sync with item changes
+            (
+                "existing-token",
+                {
+                    "sync_token": "new-token-456",
+                    "full_sync": False,
+                    "items": [{"id": "2", "content": "New task"}],
+                },
+                True,
+                "new-token-456",
+            ),
+            # Incremental sync with project changes
+            (
+                "existing-token",
+                {
+                    "sync_token": "new-token-789",
+                    "full_sync": False,
+                    "projects": [{"id": "p1", "name": "New project"}],
+                },
+                True,
+                "new-token-789",
+            ),
+            # No changes
+            (
+                "existing-token",
+                {"sync_token": "existing-token", "full_sync": False},
+                False,
+                "existing-token",
+            ),
+        ],
+        ids=["full_sync", "incremental_items", "incremental_projects", "no_changes"],
+    )
+    def test_diff_sync_response(
+        self,
+        integration,
+        initial_token,
+        response_json,
+        expected_changes,
+        expected_token,
+    ):
+        """Test _diff_sync_response reports changes and the new sync token."""
+        integration._sync_token = initial_token
 
-    async def test_check_for_changes_no_changes(self, monkeypatch):
-        """Test _check_for_changes when no changes occurred."""
-        import httpx
+        assert integration._diff_sync_response(response_json) == (
+            expected_changes,
+            expected_token,
+        )
 
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
+    async def test_check_for_changes_posts_sync_token(self, integration):
+        """Test _check_for_changes posts the current token and diffs the response."""
         integration._sync_token = "existing-token"
+        mock_client = AsyncMock()
+        mock_client.post.return_value = make_response(
+            {"sync_token": "new-token-456", "items": [{"id": "2"}]}
+        )
 
-        # Mock httpx response with no changes
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        assert await integration._check_for_changes(mock_client) == (
+            True,
+            "new-token-456",
+        )
+        mock_client.post.assert_called_once()
+        assert mock_client.post.call_args.kwargs["data"] == {
             "sync_token": "existing-token",
-            "full_sync": False,
+            "resource_types": '["items","projects"]',
         }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.post = AsyncMock(return_value=mock_response)
-
-        has_changes, new_token = await integration._check_for_changes(mock_client)
-
-        assert has_changes is False
-        assert new_token == "existing-token"
 
-    async def test_start_event_stream_yields_initial_data(self, monkeypatch):
+    async def test_start_event_stream_yields_initial_data(
+        self, integration, mock_httpx_client, mock_wait
+    ):
         """Test start_event_stream yields initial data on startup."""
-        import asyncio
-
-        import httpx
-
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
 
         # Mock fetch_data
         mock_data = {"today_tasks": [], "timestamp": "2024-01-01T00:00:00"}
-        monkeypatch.setattr(
-            integration, "fetch_data", AsyncMock(return_value=mock_data)
-        )
 
-        # Mock _check_for_changes to return changes on first call, then cancel
-        call_count = 0
+        async def mock_fetch_data():
+            return mock_data
 
-        async def mock_check_for_changes(client):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return True, "new-token"
-            # Cancel after first iteration to prevent infinite loop
-            raise asyncio.CancelledError()
+        integration.fetch_data = mock_fetch_data
 
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
+        async def mock_check_for_changes(client):
+            return True, "new-token"
 
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
+        integration._check_for_changes = mock_check_for_changes
 
-        # Collect yielded data
-        yielded_data = []
-        try:
-            async for data in integration.start_event_stream():
-                yielded_data.append(data)
-        except asyncio.CancelledError:
-            pass
+        # Stop at the first poll wait
+        mock_wait.stop_after = 1
+        yielded_data = [data async for data in integration.start_event_stream()]
 
-        # Should have yielded initial data
-        assert len(yielded_data) >= 1
-        assert yielded_data[0] == mock_data
+        assert yielded_data == [mock_data]
 
-    async def test_start_event_stream_only_yields_on_changes(self, monkeypatch):
+    async def test_start_event_stream_only_yields_on_changes(
+        self, integration, mock_httpx_client, mock_wait
+    ):
         """Test start_event_stream only yields when changes are detected."""
-        import asyncio
-
-        import httpx
-
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
-
-        # Mock asyncio.sleep to avoid actual waiting
-        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
 
         # Track fetch_data calls
         fetch_call_count = 0
@@ -688,124 +762,86 @@ class TestTodoistEventStream:
             fetch_call_count += 1
             return mock_data
 
-        monkeypatch.setattr(integration, "fetch_data", mock_fetch_data)
+        integration.fetch_data = mock_fetch_data
 
-        # Mock _check_for_changes: True, False, False, True, then cancel
-        check_results = [
-            (True, "token1"),  # Initial - has changes
-            (False, "token1"),  # No changes
-            (False, "token1"),  # No changes
-            (True, "token2"),  # Has changes
-        ]
-        check_index = 0
+        # Mock _check_for_changes: True, False, False, True
+        check_results = iter(
+            [
+                (True, "token1"),  # Initial - has changes
+                (False, "token1"),  # No changes
+                (False, "token1"),  # No changes
+                (True, "token2"),  # Has changes
+            ]
+        )
 
         async def mock_check_for_changes(client):
-            nonlocal check_index
-            if check_index >= len(check_results):
-                raise asyncio.CancelledError()
-            result = check_results[check_index]
-            check_index += 1
-            return result
-
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
-
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
-
-        # Collect yielded data
-        yielded_data = []
-        try:
-            async for data in integration.start_event_stream():
-                yielded_data.append(data)
-        except asyncio.CancelledError:
-            pass
+            return next(check_results)
+
+        integration._check_for_changes = mock_check_for_changes
+
+        # Stop at the poll wait after the last check
+        mock_wait.stop_after = 4
+        yielded_data = [data async for data in integration.start_event_stream()]
 
         # Should have yielded only twice (on changes)
-        assert len(yielded_data) == 2
+        assert yielded_data == [mock_data, mock_data]
         # fetch_data should have been called only twice (when changes detected)
         assert fetch_call_count == 2
 
-    async def test_start_event_stream_handles_http_error(self, monkeypatch):
-        """Test start_event_stream handles HTTP errors gracefully."""
-        import asyncio
-
-        import httpx
-
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
+    @pytest.mark.parametrize(
+        "error",
+        [
+            httpx.HTTPStatusError(
+                "Server error", request=SYNC_REQUEST, response=RESPONSE_500
+            ),
+            ValueError("Unexpected error"),
+        ],
+        ids=["http_error", "generic_exception"],
+    )
+    async def test_start_event_stream_recovers_from_poll_error(
+        self, integration, mock_httpx_client, mock_wait, error
+    ):
+        """Test a failed poll backs off and the next poll recovers."""
+        mock_data = {"today_tasks": [], "timestamp": "2024-01-01"}
 
-        # Mock asyncio.sleep to avoid actual waiting
-        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        async def mock_fetch_data():
+            return mock_data
 
-        mock_data = {"today_tasks": [], "timestamp": "2024-01-01"}
-        monkeypatch.setattr(
-            integration, "fetch_data", AsyncMock(return_value=mock_data)
-        )
+        integration.fetch_data = mock_fetch_data
 
-        # Mock _check_for_changes: success, HTTP error, then cancel
+        # Mock _check_for_changes: success, error, then recovery
         call_count = 0
 
         async def mock_check_for_changes(client):
             nonlocal call_count
             call_count += 1
-            if call_count == 1:
-                return True, "token1"  # Initial success
             if call_count == 2:
-                # Simulate HTTP error
-                mock_response = MagicMock()
-                mock_response.status_code = 500
-                raise httpx.HTTPStatusError(
-                    "Server error", request=MagicMock(), response=mock_response
-                )
-            if call_count == 3:
-                return True, "token2"  # Recovery
-            raise asyncio.CancelledError()
-
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
-
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
-
-        # Collect yielded data
-        yielded_data = []
-        try:
-            async for data in integration.start_event_stream():
-                yielded_data.append(data)
-        except asyncio.CancelledError:
-            pass
-
-        # Should have recovered and yielded data
-        assert len(yielded_data) >= 1
+                raise error
+            return True, f"token{call_count}"
 
-    async def test_start_event_stream_auth_error_backoff(self, monkeypatch):
-        """Test start_event_stream backs off on auth errors."""
-        import asyncio
+        integration._check_for_changes = mock_check_for_changes
 
-        import httpx
+        # Poll, backoff in place of the next poll wait, then stop after recovery
+        mock_wait.stop_after = 3
+        yielded_data = [data async for data in integration.start_event_stream()]
 
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
+        # Should have recovered and yielded data again
+        assert yielded_data == [mock_data, mock_data]
+        # Should have backed off by at most poll_interval after the first error,
+        # then returned to the poll interval
+        assert 0 <= mock_wait.calls[1] <= 1
+        assert mock_wait.calls[2] == 1
 
+    async def test_start_event_stream_auth_error_raises(
+        self, integration, mock_httpx_client, mock_wait
+    ):
+        """Test start_event_stream stops on auth errors instead of retrying."""
         mock_data = {"today_tasks": [], "timestamp": "2024-01-01"}
-        monkeypatch.setattr(
-            integration, "fetch_data", AsyncMock(return_value=mock_data)
-        )
 
-        # Track sleep calls to verify backoff
-        sleep_calls = []
-
-        async def mock_sleep(seconds):
-            sleep_calls.append(seconds)
-            if len(sleep_calls) >= 2:
-                raise asyncio.CancelledError()
+        async def mock_fetch_data():
+            return mock_data
 
-        monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+        integration.fetch_data = mock_fetch_data
 
         # Mock _check_for_changes: success, then 401 error
         call_count = 0
@@ -816,78 +852,128 @@ class TestTodoistEventStream:
             if call_count == 1:
                 return True, "token1"  # Initial success
             # Simulate auth error
-            mock_response = MagicMock()
-            mock_response.status_code = 401
             raise httpx.HTTPStatusError(
-                "Unauthorized", request=MagicMock(), response=mock_response
+                "Unauthorized", request=SYNC_REQUEST, response=RESPONSE_401
             )
 
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
-
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
+        integration._check_for_changes = mock_check_for_changes
 
-        try:
+        with pytest.raises(httpx.HTTPStatusError, match="Unauthorized"):
             async for _ in integration.start_event_stream():
                 pass
-        except asyncio.CancelledError:
+
+        # Only the poll wait ran; no retry backoff after the auth error
+        assert mock_wait.calls == [1]
+
+    async def test_start_event_stream_backoff_doubles_up_to_cap(
+        self, integration, mock_httpx_client, mock_wait, monkeypatch
+    ):
+        """Test consecutive sync failures back off exponentially up to the cap."""
+        # Take the top of each jitter range so the ceilings are observable
+        monkeypatch.setattr(
+            "integrations.todoist.integration.random.uniform", lambda low, high: high
+        )
+
+        async def mock_fetch_data():
+            return {}
+
+        integration.fetch_data = mock_fetch_data
+
+        # Mock _check_for_changes: initial success, then fail on every poll
+        call_count = 0
+
+        async def mock_check_for_changes(client):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return True, "token1"
+            raise ValueError("Unexpected error")
+
+        integration._check_for_changes = mock_check_for_changes
+
+        # Each failure's backoff replaces the poll wait; stop after ten
+        mock_wait.stop_after = 11
+        async for _ in integration.start_event_stream():
             pass
 
-        # Should have backed off with 60 second sleep on auth error
-        assert 60 in sleep_calls
+        assert mock_wait.calls == [1, 1, 2, 4, 8, 16, 32, 64, 128, 256, 300]
+
+    @pytest.mark.parametrize(
+        "fault",
+        [
+            raise_connect_timeout,
+            lambda request: httpx.Response(500),
+            lambda request: httpx.Response(429),
+            lambda request: httpx.Response(200, content=b"{not json"),
+        ],
+        ids=["network_timeout", "http_5xx", "http_429", "malformed_json"],
+    )
+    async def test_start_event_stream_recovers_from_sync_fault(
+        self, integration, mock_wait, fault
+    ):
+        """Test a faulty Sync response backs off and the next poll recovers."""
+        handlers = iter(
+            [
+                lambda request: httpx.Response(
+                    200, json={"sync_token": "token1", "full_sync": True}
+                ),
+                fault,
+                lambda request: httpx.Response(
+                    200, json={"sync_token": "token2", "items": [{"id": "1"}]}
+                ),
+            ]
+        )
 
-    async def test_start_event_stream_initial_error_raises(self, monkeypatch):
-        """Test start_event_stream raises on initial sync failure."""
-        import httpx
+        async def mock_fetch_data():
+            return {}
 
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
+        integration.fetch_data = mock_fetch_data
+
+        # Poll, backoff in place of the next poll wait, then stop after recovery
+        mock_wait.stop_after = 3
+        transport = httpx.MockTransport(lambda request: next(handlers)(request))
+        async with httpx.AsyncClient(transport=transport) as client:
+            integration._client = client
+            yielded_data = [data async for data in integration.start_event_stream()]
+
+        assert yielded_data == [{}, {}]
+        assert integration._sync_token == "token2"
+        assert 0 <= mock_wait.calls[1] <= 1
+
+    async def test_start_event_stream_initial_error_raises(
+        self, integration, mock_httpx_client
+    ):
+        """Test start_event_stream raises on initial sync failure."""
 
         # Mock _check_for_changes to fail on first call
         async def mock_check_for_changes(client):
             raise RuntimeError("Initial sync failed")
 
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
-
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
+        integration._check_for_changes = mock_check_for_changes
 
         # Should raise on initial failure
         with pytest.raises(RuntimeError, match="Initial sync failed"):
             async for _ in integration.start_event_stream():
                 pass
 
-    async def test_start_event_stream_handles_generic_exception(self, monkeypatch):
-        """Test start_event_stream handles generic exceptions gracefully."""
-        import asyncio
-
-        import httpx
-
-        config = {"api_token": "test-token-123", "poll_interval": 1}
-        integration = TodoistIntegration(config)
-
-        # Mock asyncio.sleep to avoid actual waiting
-        sleep_calls = []
+    async def test_start_event_stream_initial_sync_deadline(
+        self, integration, mock_httpx_client
+    ):
+        """Test a hung initial sync fails with TimeoutError at timeout_seconds."""
 
-        async def mock_sleep(seconds):
-            sleep_calls.append(seconds)
-            if len(sleep_calls) >= 2:
-                raise asyncio.CancelledError()
+        async def hang(client):
+            await asyncio.Event().wait()
 
-        monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+        integration._check_for_changes = hang
 
-        mock_data = {"today_tasks": [], "timestamp": "2024-01-01"}
-        monkeypatch.setattr(
-            integration, "fetch_data", AsyncMock(return_value=mock_data)
-        )
+        with pytest.raises(TimeoutError):
+            async for _ in integration.start_event_stream():
+                pass
 
-        # Mock _check_for_changes: success, generic exception, then cancel
+    async def test_start_event_stream_poll_deadline_backs_off(
+        self, integration, mock_httpx_client, mock_wait
+    ):
+        """Test a hung poll times out and is retried like any other failure."""
         call_count = 0
 
         async def mock_check_for_changes(client):
@@ -895,150 +981,108 @@ class TestTodoistEventStream:
             call_count += 1
             if call_count == 1:
                 return True, "token1"  # Initial success
-            # Simulate generic exception (not HTTPStatusError)
-            raise ValueError("Unexpected error")
+            await asyncio.Event().wait()
 
-        monkeypatch.setattr(integration, "_check_for_changes", mock_check_for_changes)
+        async def mock_fetch_data():
+            return {}
 
-        # Mock httpx.AsyncClient
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        monkeypatch.setattr(httpx, "AsyncClient", lambda: mock_client)
+        integration._check_for_changes = mock_check_for_changes
+        integration.fetch_data = mock_fetch_data
 
-        # Collect yielded data
-        yielded_data = []
-        try:
-            async for data in integration.start_event_stream():
-                yielded_data.append(data)
-        except asyncio.CancelledError:
+        # Stop during the backoff after the timeout
+        mock_wait.stop_after = 2
+        async for _ in integration.start_event_stream():
             pass
 
-        # Should have yielded initial data and then handled the error
-        assert len(yielded_data) >= 1
-        # Should have slept with poll_interval after generic error
-        assert 1 in sleep_calls
+        # A stop during backoff ends the stream without another poll or wait
+        assert call_count == 2
+        assert len(mock_wait.calls) == 2
+        assert 0 <= mock_wait.calls[1] <= 1
+
+
+# Sparkline for a week with no completed tasks
+EMPTY_SPARKLINE = {"counts": [0] * 7, "max": 0, "total": 0, "bars": "▁▁▁▁▁▁▁"}
 
 
 class TestTodoistCompletedTasks:
     """Tests for completed tasks functionality."""
 
-    async def test_fetch_completed_with_billing_successful(self, monkeypatch):
+    async def test_fetch_completed_with_billing_successful(
+        self, integration, mock_httpx_client
+    ):
         """Test _fetch_completed_with_billing successfully fetches and processes tasks."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
 
-        # Mock projects for project name mapping
-        mock_api = AsyncMock()
-        mock_api.get_projects.return_value = [
+        # Build project map for project name mapping
+        projects = [
             create_mock_project("proj1", "Work"),
             create_mock_project("proj2", "Personal"),
         ]
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
-        # Build project map
-        projects = await mock_api.get_projects()
         project_map = {p.id: p.name for p in projects}
 
         # Mock httpx response with completed tasks (API v1 format)
-        today = datetime.now().date()
-        yesterday = (today - timedelta(days=1)).isoformat()
-        today_str = today.isoformat()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "items": [
+        mock_httpx_client.get.return_value = make_completed_page(
+            [
                 {
                     "id": "task1",
                     "content": "Completed today 1",
                     "project_id": "proj1",
-                    "completed_at": f"{today_str}T10:00:00Z",
+                    "completed_at": f"{TODAY_STR}T10:00:00Z",
                     "duration": {"amount": 30, "unit": "minute"},
                 },
                 {
                     "id": "task2",
                     "content": "Completed today 2",
                     "project_id": "proj2",
-                    "completed_at": f"{today_str}T14:30:00Z",
+                    "completed_at": f"{TODAY_STR}T14:30:00Z",
                     "duration": {"amount": 60, "unit": "minute"},
                 },
                 {
                     "id": "task3",
                     "content": "Completed yesterday",
                     "project_id": "proj1",
-                    "completed_at": f"{yesterday}T12:00:00Z",
+                    "completed_at": f"{YESTERDAY_STR}T12:00:00Z",
                     "duration": None,
                 },
-            ],
-            "next_cursor": None,
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+            ]
+        )
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
         )
 
         # Verify today's tasks
-        assert len(today_tasks) == 2
         # Should be sorted by completion time (most recent first)
-        assert today_tasks[0]["content"] == "Completed today 2"
-        assert today_tasks[0]["project_name"] == "Personal"
-        assert today_tasks[1]["content"] == "Completed today 1"
-        assert today_tasks[1]["project_name"] == "Work"
-
-        # Verify sparkline
-        assert sparkline["total"] == 3  # Total across all days
-        assert sparkline["max"] >= 1
-        assert len(sparkline["counts"]) == 7  # 7 days
-        assert len(sparkline["bars"]) == 7
-
-    async def test_fetch_completed_with_billing_with_missing_project(self, monkeypatch):
-        """Test _fetch_completed_with_billing handles tasks with unknown project_id."""
-        import httpx
+        assert [(t["content"], t["project_name"]) for t in today_tasks] == [
+            ("Completed today 2", "Personal"),
+            ("Completed today 1", "Work"),
+        ]
 
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
+        # Monday-to-Sunday counts; TODAY is a Sunday
+        assert sparkline == {
+            "counts": [0, 0, 0, 0, 0, 1, 2],
+            "max": 2,
+            "total": 3,
+            "bars": "▁▁▁▁▁▄█",
+        }
 
-        project_map = {"proj1": "Work"}  # Only one project
+    async def test_fetch_completed_with_billing_with_missing_project(
+        self, integration, mock_httpx_client
+    ):
+        """Test _fetch_completed_with_billing handles tasks with unknown project_id."""
 
-        today_str = datetime.now().date().isoformat()
+        project_map = {"proj1": "Work"}  # Only one project
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "items": [
+        mock_httpx_client.get.return_value = make_completed_page(
+            [
                 {
                     "id": "1",
                     "content": "Task with unknown project",
                     "project_id": "unknown_proj",
-                    "completed_at": f"{today_str}T10:00:00Z",
+                    "completed_at": f"{TODAY_STR}T10:00:00Z",
                     "duration": None,
                 }
-            ],
-            "next_cursor": None,
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+            ]
+        )
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
@@ -1048,141 +1092,71 @@ class TestTodoistCompletedTasks:
         assert len(today_tasks) == 1
         assert today_tasks[0]["project_name"] == ""  # Empty string for unknown project
 
-    async def test_fetch_completed_with_billing_api_error(self, monkeypatch):
+    async def test_fetch_completed_with_billing_api_error(
+        self, integration, mock_httpx_client
+    ):
         """Test _fetch_completed_with_billing handles API errors gracefully."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
 
         project_map = {}
 
         # Mock httpx to raise an error
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(side_effect=Exception("API error"))
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+        mock_httpx_client.get.side_effect = Exception("API error")
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
         )
 
         # Should return empty data on error
-        assert today_tasks == []
-        assert sparkline["counts"] == [0] * 7
-        assert sparkline["max"] == 0
-        assert sparkline["total"] == 0
-        assert sparkline["bars"] == "▁▁▁▁▁▁▁"
+        assert (today_tasks, sparkline) == ([], EMPTY_SPARKLINE)
 
-    async def test_fetch_completed_with_billing_empty_response(self, monkeypatch):
+    async def test_fetch_completed_with_billing_empty_response(
+        self, integration, mock_httpx_client
+    ):
         """Test _fetch_completed_with_billing handles empty items list."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
 
         project_map = {}
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"items": [], "next_cursor": None}
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+        mock_httpx_client.get.return_value = make_completed_page([])
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
         )
 
         # Should return empty sparkline
-        assert today_tasks == []
-        assert sparkline["counts"] == [0] * 7
-        assert sparkline["max"] == 0
-        assert sparkline["total"] == 0
-
-    def test_counts_to_sparkline_empty_list(self):
-        """Test _counts_to_sparkline with empty list."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        result = integration._counts_to_sparkline([])
-
-        assert result == ""
-
-    def test_counts_to_sparkline_all_zeros(self):
-        """Test _counts_to_sparkline with all zero counts."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        result = integration._counts_to_sparkline([0, 0, 0, 0, 0])
-
-        assert result == "▁▁▁▁▁"
-
-    def test_counts_to_sparkline_various_counts(self):
-        """Test _counts_to_sparkline with various count values."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        # Test with a range of values
-        counts = [0, 1, 2, 4, 8]
-        result = integration._counts_to_sparkline(counts)
-
-        # Should return 5 characters (one per count)
-        assert len(result) == 5
-        # All should be valid sparkline characters
-        valid_chars = "▁▂▃▄▅▆▇█"
-        assert all(c in valid_chars for c in result)
-        # First should be lowest (0 maps to ▁)
-        assert result[0] == "▁"
-        # Last should be highest (8 maps to █)
-        assert result[4] == "█"
-
-    def test_counts_to_sparkline_single_value(self):
-        """Test _counts_to_sparkline with single non-zero value."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        result = integration._counts_to_sparkline([5])
-
-        # Single max value should map to highest bar
-        assert result == "█"
-
-    def test_counts_to_sparkline_equal_values(self):
-        """Test _counts_to_sparkline with all equal non-zero values."""
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
-
-        result = integration._counts_to_sparkline([3, 3, 3, 3])
-
-        # All equal values should map to highest bar
-        assert result == "████"
-
-    async def test_fetch_completed_with_billing_empty_completed_at(self, monkeypatch):
+        assert (today_tasks, sparkline) == ([], EMPTY_SPARKLINE)
+
+    @pytest.mark.parametrize(
+        "counts,expected",
+        [
+            ([], ""),
+            ([0, 0, 0, 0, 0], "▁▁▁▁▁"),
+            # Bars scale to the max: 0 maps to ▁ and the max to █
+            ([0, 1, 2, 4, 8], "▁▁▂▄█"),
+            # A lone or repeated non-zero value is the max, so the top bar
+            ([5], "█"),
+            ([3, 3, 3, 3], "████"),
+        ],
+        ids=[
+            "empty_list",
+            "all_zeros",
+            "various_counts",
+            "single_value",
+            "equal_values",
+        ],
+    )
+    def test_counts_to_sparkline(self, integration, counts, expected):
+        """Test _counts_to_sparkline maps counts to bars scaled to the max."""
+        assert integration._counts_to_sparkline(counts) == expected
+
+    async def test_fetch_completed_with_billing_empty_completed_at(
+        self, integration, mock_httpx_client
+    ):
         """Test _fetch_completed_with_billing skips items with empty completed_at."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
 
         project_map = {}
 
-        today_str = datetime.now().date().isoformat()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "items": [
+        mock_httpx_client.get.return_value = make_completed_page(
+            [
                 {
                     "id": "1",
                     "content": "Task without completed_at",
@@ -1201,23 +1175,11 @@ class TestTodoistCompletedTasks:
                     "id": "3",
                     "content": "Valid task",
                     "project_id": "proj1",
-                    "completed_at": f"{today_str}T10:00:00Z",
+                    "completed_at": f"{TODAY_STR}T10:00:00Z",
                     "duration": {"amount": 30, "unit": "minute"},
                 },
-            ],
-            "next_cursor": None,
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+            ]
+        )
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
@@ -1229,24 +1191,17 @@ class TestTodoistCompletedTasks:
         assert sparkline["total"] == 1
 
     async def test_fetch_completed_with_billing_old_tasks_outside_window(
-        self, monkeypatch
+        self, integration, mock_httpx_client
     ):
         """Test _fetch_completed_with_billing ignores tasks outside 7-day window."""
-        import httpx
-
-        config = {"api_token": "test-token-123"}
-        integration = TodoistIntegration(config)
 
         project_map = {}
 
-        today = datetime.now().date()
-        today_str = today.isoformat()
         # Task from 10 days ago (outside the 7-day window)
-        old_date = (today - timedelta(days=10)).isoformat()
+        old_date = (TODAY - timedelta(days=10)).isoformat()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "items": [
+        mock_httpx_client.get.return_value = make_completed_page(
+            [
                 {
                     "id": "1",
                     "content": "Old task",
@@ -1258,23 +1213,11 @@ class TestTodoistCompletedTasks:
                     "id": "2",
                     "content": "Recent task",
                     "project_id": "proj1",
-                    "completed_at": f"{today_str}T14:00:00Z",
+                    "completed_at": f"{TODAY_STR}T14:00:00Z",
                     "duration": None,
                 },
-            ],
-            "next_cursor": None,
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        def mock_async_client_factory(*args, **kwargs):
-            return mock_client
-
-        monkeypatch.setattr(httpx, "AsyncClient", mock_async_client_factory)
+            ]
+        )
 
         today_tasks, weekly_tasks, sparkline = (
             await integration._fetch_completed_with_billing(project_map)
@@ -1286,253 +1229,200 @@ class TestTodoistCompletedTasks:
         assert today_tasks[0]["content"] == "Recent task"
 
 
-class TestTodoistWorkProjects:
-    """Tests for work projects functionality."""
-
-    def test_parse_duration_to_minutes_with_minutes(self):
-        """Test parsing duration in minutes."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
-        duration = {"amount": 30, "unit": "minute"}
-        result = integration._parse_duration_to_minutes(duration)
-
-        assert result == 30
-
-    def test_parse_duration_to_minutes_with_hours(self):
-        """Test parsing duration in hours."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
-        duration = {"amount": 2, "unit": "hour"}
-        result = integration._parse_duration_to_minutes(duration)
-
-        assert result == 120
-
-    def test_parse_duration_to_minutes_with_days(self):
-        """Test parsing duration in days (8-hour workday)."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
-        duration = {"amount": 1, "unit": "day"}
-        result = integration._parse_duration_to_minutes(duration)
-
-        assert result == 480  # 1 day * 8 hours * 60 minutes
-
-    def test_parse_duration_to_minutes_with_none(self):
-        """Test parsing None duration."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
+# Work parent project with one targeted sub-project, shared by the work tests
+WORK_CONFIG = {
+    "work_parent_project": "Work",
+    "work_project_targets": {"Foodtrails": 20},
+}
+# Work has two sub-projects; only Foodtrails has a target in WORK_CONFIG
+WORK_PROJECT_MAP = {
+    "work": "Work",
+    "sub1": "Foodtrails",
+    "sub2": "KellyMitchell Costco",
+    "other": "Personal",
+}
+WORK_PARENT_MAP = {"work": None, "sub1": "work", "sub2": "work", "other": None}
+# The same hierarchy as API projects, for fetch_data tests
+WORK_PROJECTS = [
+    create_mock_project(pid, name, WORK_PARENT_MAP[pid])
+    for pid, name in WORK_PROJECT_MAP.items()
+]
 
-        result = integration._parse_duration_to_minutes(None)
 
-        assert result == 0
-
-    def test_parse_duration_to_minutes_with_unknown_unit(self):
-        """Test parsing duration with unknown unit."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
-        duration = {"amount": 5, "unit": "unknown"}
-        result = integration._parse_duration_to_minutes(duration)
-
-        assert result == 0
+class TestTodoistWorkProjects:
+    """Tests for work projects functionality."""
 
-    def test_process_work_projects_empty_config(self):
+    @pytest.mark.parametrize(
+        "duration,expected",
+        [
+            ({"amount": 30, "unit": "minute"}, 30),
+            ({"amount": 2, "unit": "hour"}, 120),
+            ({"amount": 1, "unit": "day"}, 480),  # 8-hour workday
+            (None, 0),
+            ({"amount": 5, "unit": "unknown"}, 0),
+        ],
+        ids=["minutes", "hours", "days", "none", "unknown_unit"],
+    )
+    def test_parse_duration_to_minutes(self, integration, duration, expected):
+        """Test _parse_duration_to_minutes converts each unit to minutes."""
+        assert integration._parse_duration_to_minutes(duration) == expected
+
+    def test_process_work_projects_empty_config(self, integration):
         """Test _process_work_projects with no work parent project configured."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
         result, project_ids = integration._process_work_projects([], [], {}, {})
 
         assert result == []
         assert project_ids == set()
 
-    def test_process_work_projects_discovers_sub_projects(self):
-        """Test _process_work_projects discovers sub-projects dynamically."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20},
-        }
-        integration = TodoistIntegration(config)
-
-        completed_tasks = [
-            {
-                "id": "1",
-                "content": "Completed task 1",
-                "project_id": "sub1",
-                "duration": {"amount": 2, "unit": "hour"},
-            },
-            {
-                "id": "2",
-                "content": "Completed task 2",
-                "project_id": "sub1",
-                "duration": {"amount": 30, "unit": "minute"},
-            },
-            {
-                "id": "3",
-                "content": "Other project task",
-                "project_id": "other",
-                "duration": {"amount": 1, "unit": "hour"},
-            },
-        ]
-        today_tasks = []
-        # Work is parent, Foodtrails is sub-project
-        project_map = {"work": "Work", "sub1": "Foodtrails", "other": "Personal"}
-        project_parent_map = {"work": None, "sub1": "work", "other": None}
-
-        result, project_ids = integration._process_work_projects(
-            completed_tasks, today_tasks, project_map, project_parent_map
-        )
-
-        assert len(result) == 1
-        assert result[0]["name"] == "Foodtrails"
-        assert result[0]["completed_count"] == 2
-        assert result[0]["total_hours"] == 2.5  # 2h + 30m
-        assert len(result[0]["completed_tasks"]) == 2
-        assert project_ids == {"sub1"}
-
-    def test_process_work_projects_with_active_tasks(self):
-        """Test _process_work_projects with active tasks in sub-projects."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20},
-        }
-        integration = TodoistIntegration(config)
-
-        completed_tasks = []
-        today_tasks = [
-            {"id": "1", "content": "Active task 1", "project_id": "sub1"},
-            {"id": "2", "content": "Active task 2", "project_id": "sub1"},
-        ]
-        project_map = {"work": "Work", "sub1": "Foodtrails"}
-        project_parent_map = {"work": None, "sub1": "work"}
-
-        result, project_ids = integration._process_work_projects(
-            completed_tasks, today_tasks, project_map, project_parent_map
-        )
-
-        assert len(result) == 1
-        assert result[0]["name"] == "Foodtrails"
-        assert result[0]["active_count"] == 2
-        assert result[0]["completed_count"] == 0
-        assert result[0]["total_hours"] == 0
-        assert project_ids == {"sub1"}
-
-    def test_process_work_projects_limits_tasks(self):
-        """Test _process_work_projects limits tasks to 5 completed and 3 active."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20},
-        }
-        integration = TodoistIntegration(config)
-
-        # Create more tasks than the limit
-        completed_tasks = [
-            {"id": str(i), "content": f"Task {i}", "project_id": "sub1"}
-            for i in range(10)
-        ]
-        today_tasks = [
-            {"id": str(i), "content": f"Active {i}", "project_id": "sub1"}
-            for i in range(10)
-        ]
-        project_map = {"work": "Work", "sub1": "Foodtrails"}
-        project_parent_map = {"work": None, "sub1": "work"}
-
-        result, project_ids = integration._process_work_projects(
-            completed_tasks, today_tasks, project_map, project_parent_map
-        )
-
-        assert len(result) == 1
-        assert len(result[0]["completed_tasks"]) == 5  # Limited to 5
-        assert len(result[0]["active_tasks"]) == 3  # Limited to 3
-        assert result[0]["completed_count"] == 10  # Full count
-        assert result[0]["active_count"] == 10  # Full count
-        assert project_ids == {"sub1"}
-
-    def test_process_work_projects_discovers_multiple_sub_projects(self):
-        """Test _process_work_projects only includes sub-projects with configured targets."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20, "KellyMitchell Costco": 10},
-        }
-        integration = TodoistIntegration(config)
-
-        completed_tasks = [
-            {
-                "id": "1",
-                "content": "Foodtrails task",
-                "project_id": "sub1",
-                "duration": {"amount": 2, "unit": "hour"},
-            },
-            {
-                "id": "2",
-                "content": "Costco task",
-                "project_id": "sub2",
-                "duration": {"amount": 1, "unit": "hour"},
-            },
-        ]
-        today_tasks = []
-        project_map = {
-            "work": "Work",
-            "sub1": "Foodtrails",
-            "sub2": "KellyMitchell Costco",
-        }
-        project_parent_map = {"work": None, "sub1": "work", "sub2": "work"}
-
-        result, project_ids = integration._process_work_projects(
-            completed_tasks, today_tasks, project_map, project_parent_map
-        )
-
-        assert len(result) == 2
-        # Results can be in any order since they're discovered from dict
-        names = {r["name"] for r in result}
-        assert names == {"Foodtrails", "KellyMitchell Costco"}
-        assert project_ids == {"sub1", "sub2"}
-
-    def test_process_work_projects_parent_not_found(self):
-        """Test _process_work_projects returns empty when parent not found."""
-        config = {"api_token": "test-token", "work_parent_project": "Unknown Parent"}
-        integration = TodoistIntegration(config)
-
-        completed_tasks = []
-        today_tasks = []
-        project_map = {"proj1": "Work"}
-        project_parent_map = {"proj1": None}
+    @pytest.mark.parametrize(
+        "integration,completed_tasks,today_tasks,expected,expected_ids",
+        [
+            pytest.param(
+                WORK_CONFIG,
+                [
+                    {
+                        "id": "1",
+                        "project_id": "sub1",
+                        "duration": {"amount": 2, "unit": "hour"},
+                    },
+                    {
+                        "id": "2",
+                        "project_id": "sub1",
+                        "duration": {"amount": 30, "unit": "minute"},
+                    },
+                    {
+                        "id": "3",
+                        "project_id": "other",
+                        "duration": {"amount": 1, "unit": "hour"},
+                    },
+                ],
+                [],
+                {
+                    "Foodtrails": {
+                        "completed_count": 2,
+                        "active_count": 0,
+                        "total_hours": 2.5,  # 2h + 30m; "other" ignored
+                        "completed_tasks": 2,
+                        "active_tasks": 0,
+                    }
+                },
+                # Untargeted sub-projects are still work projects
+                {"sub1", "sub2"},
+                id="discovers_sub_projects",
+            ),
+            pytest.param(
+                WORK_CONFIG,
+                [],
+                [{"id": "1", "project_id": "sub1"}, {"id": "2", "project_id": "sub1"}],
+                {
+                    "Foodtrails": {
+                        "completed_count": 0,
+                        "active_count": 2,
+                        "total_hours": 0,
+                        "completed_tasks": 0,
+                        "active_tasks": 2,
+                    }
+                },
+                {"sub1", "sub2"},
+                id="with_active_tasks",
+            ),
+            pytest.param(
+                WORK_CONFIG,
+                [{"id": str(i), "project_id": "sub1"} for i in range(10)],
+                [{"id": str(i), "project_id": "sub1"} for i in range(10)],
+                # Full counts, but only 5 completed and 3 active tasks shown
+                {
+                    "Foodtrails": {
+                        "completed_count": 10,
+                        "active_count": 10,
+                        "total_hours": 0,
+                        "completed_tasks": 5,
+                        "active_tasks": 3,
+                    }
+                },
+                {"sub1", "sub2"},
+                id="limits_tasks",
+            ),
+            pytest.param(
+                {
+                    "work_parent_project": "Work",
+                    "work_project_targets": {
+                        "Foodtrails": 20,
+                        "KellyMitchell Costco": 10,
+                    },
+                },
+                [
+                    {
+                        "id": "1",
+                        "project_id": "sub1",
+                        "duration": {"amount": 2, "unit": "hour"},
+                    },
+                    {
+                        "id": "2",
+                        "project_id": "sub2",
+                        "duration": {"amount": 1, "unit": "hour"},
+                    },
+                ],
+                [],
+                {
+                    "Foodtrails": {
+                        "completed_count": 1,
+                        "active_count": 0,
+                        "total_hours": 2.0,
+                        "completed_tasks": 1,
+                        "active_tasks": 0,
+                    },
+                    "KellyMitchell Costco": {
+                        "completed_count": 1,
+                        "active_count": 0,
+                        "total_hours": 1.0,
+                        "completed_tasks": 1,
+                        "active_tasks": 0,
+                    },
+                },
+                {"sub1", "sub2"},
+                id="discovers_multiple_sub_projects",
+            ),
+            pytest.param(
+                {"work_parent_project": "Unknown Parent"},
+                [],
+                [],
+                {},
+                set(),
+                id="parent_not_found",
+            ),
+        ],
+        indirect=["integration"],
+    )
+    def test_process_work_projects(
+        self, integration, completed_tasks, today_tasks, expected, expected_ids
+    ):
+        """Test _process_work_projects groups tasks under targeted sub-projects.
 
+        expected maps each project name to the result fields it checks; task
+        lists are compared by how many tasks are shown.
+        """
         result, project_ids = integration._process_work_projects(
-            completed_tasks, today_tasks, project_map, project_parent_map
+            completed_tasks, today_tasks, WORK_PROJECT_MAP, WORK_PARENT_MAP
         )
 
-        assert result == []
-        assert project_ids == set()
-
-    async def test_fetch_data_includes_work_projects(self, monkeypatch):
+        assert {
+            r["name"]: {
+                key: len(r[key]) if isinstance(r[key], list) else r[key]
+                for key in expected.get(r["name"], ())
+            }
+            for r in result
+        } == expected
+        assert project_ids == expected_ids
+
+    @pytest.mark.parametrize("integration", [WORK_CONFIG], indirect=True)
+    async def test_fetch_data_includes_work_projects(self, integration, stub_api):
         """Test fetch_data includes work_projects in response."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20},
-        }
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
-
         # Mock the API client with parent/child projects
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Task 1", today_str, project_id="sub1"),
-        ]
-        mock_api.get_projects.return_value = [
-            create_mock_project("work", "Work"),
-            create_mock_project("sub1", "Foodtrails", parent_id="work"),
+        stub_api.tasks = [
+            create_mock_task("1", "Task 1", TODAY_STR, project_id="sub1"),
         ]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.projects = WORK_PROJECTS
 
         data = await integration.fetch_data()
 
@@ -1543,47 +1433,25 @@ class TestTodoistWorkProjects:
         assert data["work_projects"][0]["name"] == "Foodtrails"
 
     async def test_fetch_data_work_projects_empty_when_not_configured(
-        self, monkeypatch
+        self, integration, stub_api
     ):
         """Test fetch_data returns empty work_projects when not configured."""
-        config = {"api_token": "test-token"}
-        integration = TodoistIntegration(config)
-
-        # Mock the API client
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = []
-        mock_api.get_projects.return_value = []
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
-
         data = await integration.fetch_data()
 
         assert data["work_projects"] == []
 
-    async def test_fetch_data_filters_work_tasks_from_general_queue(self, monkeypatch):
+    @pytest.mark.parametrize("integration", [WORK_CONFIG], indirect=True)
+    async def test_fetch_data_filters_work_tasks_from_general_queue(
+        self, integration, stub_api
+    ):
         """Test that work sub-project tasks are filtered from general today/overdue queues."""
-        config = {
-            "api_token": "test-token",
-            "work_parent_project": "Work",
-            "work_project_targets": {"Foodtrails": 20},
-        }
-        integration = TodoistIntegration(config)
-
-        today_str = datetime.now().date().isoformat()
 
         # Mock the API client with tasks in both work and personal projects
-        mock_api = AsyncMock()
-        mock_api.get_tasks.return_value = [
-            create_mock_task("1", "Work task", today_str, project_id="sub1"),
-            create_mock_task("2", "Personal task", today_str, project_id="personal"),
-        ]
-        mock_api.get_projects.return_value = [
-            create_mock_project("work", "Work"),
-            create_mock_project("sub1", "Foodtrails", parent_id="work"),
-            create_mock_project("personal", "Personal"),
+        stub_api.tasks = [
+            create_mock_task("1", "Work task", TODAY_STR, project_id="sub1"),
+            create_mock_task("2", "Personal task", TODAY_STR, project_id="other"),
         ]
-
-        monkeypatch.setattr(integration, "_get_api", lambda: mock_api)
+        stub_api.projects = WORK_PROJECTS
 
         data = await integration.fetch_data()
 